@@ -1,10 +1,377 @@
 """HTML report generation for resolved policies."""
 
-import json
+import re
 import base64
+import hashlib
+import shutil
 import markdown
 from pathlib import Path
-from models.arc import ResolvedPolicy
+from misc.config import config
+from pydantic_core import to_json
+from models.findings import ARCFinding
+from typing import Callable, Iterator, TextIO
+from models.arc import ResolvedPolicy, ResolvedRule, ResolvedVariable
+
+# Multiple of 3 bytes so that no padding is emitted in the middle of the stream
+_B64_CHUNK_SIZE = 57 * 1024
+
+# Static parts of the report, kept out of the f-strings so they are built once at import time
+_STYLE = """        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; background: #f5f5f5; }
+        .container { display: flex; height: 100vh; }
+        .sidebar { width: 500px; background: white; overflow-y: auto; border-right: 1px solid #ddd; min-width: 200px; max-width: 800px; }
+        .resizer { width: 5px; cursor: col-resize; background: #ddd; flex-shrink: 0; }
+        .resizer:hover { background: #ff9900; }
+        .content { flex: 1; display: flex; flex-direction: column; }
+        .header { background: #232f3e; color: white; padding: 20px; }
+        .header h1 { font-size: 24px; margin-bottom: 5px; }
+        .header p { opacity: 0.8; font-size: 14px; }
+        .documents { display: flex; height: calc(100vh - 80px); }
+        .doc-panel { flex: 1; display: flex; flex-direction: column; border-right: 1px solid #ddd; }
+        .doc-panel:last-child { border-right: none; }
+        .doc-header { background: #f8f9fa; padding: 10px 15px; border-bottom: 1px solid #ddd; font-weight: 600; }
+        .doc-viewer { flex: 1; background: #525252; }
+        iframe { width: 100%; height: 100%; border: none; }
+        .chapter { border-bottom: 1px solid #eee; }
+        .chapter-header { padding: 15px; background: #f8f9fa; cursor: pointer; font-weight: 600; }
+        .chapter-header:hover { background: #e9ecef; }
+        .chapter-content { display: none; }
+        .chapter.expanded .chapter-content { display: block; }
+        .policy { border-bottom: 1px solid #f0f0f0; }
+        .policy-header { padding: 12px 15px; cursor: pointer; background: white; }
+        .policy-header:hover { background: #f8f9fa; }
+        .policy-name { font-weight: 600; color: #232f3e; margin-bottom: 4px; }
+        .policy-desc { font-size: 13px; color: #666; }
+        .policy-content { display: none; padding: 15px; background: #fafafa; }
+        .policy.expanded .policy-content { display: block; }
+        .section { margin-bottom: 20px; }
+        .section-title { font-weight: 600; color: #232f3e; margin-bottom: 8px; font-size: 14px; }
+        .variable { background: white; padding: 10px; margin-bottom: 8px; border-radius: 4px; border-left: 3px solid #ff9900; }
+        .variable-name { font-weight: 600; color: #232f3e; }
+        .variable-value { color: #0073bb; margin-top: 4px; }
+        .variable-desc { font-size: 12px; color: #666; margin-top: 4px; }
+        .rule { background: white; padding: 10px; margin-bottom: 8px; border-radius: 4px; }
+        .rule-id { font-weight: 600; color: #666; font-size: 12px; }
+        .rule-expr { font-family: 'Courier New', monospace; font-size: 13px; margin-top: 4px; color: #232f3e; }
+        .comments { background: #fff3cd; padding: 12px; border-radius: 4px; border-left: 3px solid #ffc107; }
+        .comments-title { font-weight: 600; color: #856404; margin-bottom: 8px; }
+        .comments-text { color: #856404; font-size: 13px; white-space: pre-wrap; }
+        .comments-text ul, .comments-text ol { margin: 8px 0; padding-left: 20px; }
+        .finding { padding: 12px; border-radius: 4px; margin-bottom: 8px; }
+        .finding-success { background: #d4edda; border-left: 3px solid #28a745; color: #155724; }
+        .finding-warning { background: #fff3cd; border-left: 3px solid #ffc107; color: #856404; }
+        .finding-error { background: #f8d7da; border-left: 3px solid #dc3545; color: #721c24; }
+        .finding-text { font-size: 13px; }
+        .finding-text strong { font-weight: 600; }
+        .finding-text ul { margin: 8px 0; padding-left: 20px; list-style-type: disc; }
+        .finding-text ol { margin: 8px 0; padding-left: 20px; }
+        .finding-text li { margin: 4px 0; }
+        .tab-container { display: flex; background: #f8f9fa; border-bottom: 1px solid #ddd; }
+        .tab { padding: 10px 20px; cursor: pointer; border-right: 1px solid #ddd; }
+        .tab.active { background: white; font-weight: 600; }
+        .tab:hover { background: #e9ecef; }
+        .tab.active:hover { background: white; }
+        table { border-collapse: collapse; width: 100%; margin: 10px 0; background: white; }
+        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+        th { background: #f8f9fa; font-weight: 600; color: #232f3e; }
+        tr:hover { background: #f8f9fa; }
+        .tooltip { position: relative; cursor: help; border-bottom: 1px dotted #666; }
+        .tooltip .tooltiptext { visibility: hidden; width: 300px; background: #232f3e; color: white; text-align: left; border-radius: 4px; padding: 8px; position: absolute; z-index: 1; bottom: 125%; left: 50%; margin-left: -150px; opacity: 0; transition: opacity 0.3s; font-size: 12px; }
+        .tooltip:hover .tooltiptext { visibility: visible; opacity: 1; }
+"""
+
+_SCRIPT = """        function toggleChapter(idx) {
+            const chapter = document.getElementById(`chapter-${idx}`);
+            chapter.classList.toggle('expanded');
+        }
+        
+        function togglePolicy(chapterIdx, policyIdx) {
+            const policy = document.getElementById(`policy-${chapterIdx}-${policyIdx}`);
+            policy.classList.toggle('expanded');
+        }
+        
+        function switchTab(idx) {
+            document.querySelectorAll('.tab').forEach((tab, i) => {
+                tab.classList.toggle('active', i === idx);
+            });
+            document.querySelectorAll('.doc-panel').forEach((panel, i) => {
+                panel.style.display = i === idx ? 'flex' : 'none';
+            });
+        }
+        
+        const resizer = document.getElementById('resizer');
+        const sidebar = document.getElementById('sidebar');
+        let isResizing = false;
+        
+        resizer.addEventListener('mousedown', (e) => {
+            isResizing = true;
+            document.body.style.cursor = 'col-resize';
+        });
+        
+        document.addEventListener('mousemove', (e) => {
+            if (!isResizing) return;
+            const newWidth = e.clientX;
+            if (newWidth >= 200 && newWidth <= 800) {
+                sidebar.style.width = newWidth + 'px';
+            }
+        });
+        
+        document.addEventListener('mouseup', () => {
+            isResizing = false;
+            document.body.style.cursor = 'default';
+        });
+"""
+
+
+def _minify_css(css: str) -> str:
+    """Remove comments and all non-significant whitespace from a stylesheet."""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s*([{}:;,])\s*', r'\1', css)
+    return css.replace(';}', '}').strip()
+
+
+def _minify_js(js: str) -> str:
+    """Remove indentation and blank lines from a script, keeping line breaks so no statements are merged."""
+    return '\n'.join(line.strip() for line in js.splitlines() if line.strip())
+
+
+# Templates for the fragments repeated for every policy, finding, variable and rule
+_POLICY_HEADER_TEMPLATE = """
+                    <div class="policy" id="policy-{chapter_idx}-{policy_idx}">
+                        <div class="policy-header" onclick="togglePolicy({chapter_idx}, {policy_idx})">
+                            <div class="policy-name">{name}</div>
+                            <div class="policy-desc">{description}</div>
+                        </div>
+                        <div class="policy-content">
+"""
+_FINDING_TEMPLATE = """
+                                <div class="finding finding-{severity}">
+                                    <div class="finding-text">{insight}</div>
+                                </div>
+"""
+_VARIABLE_TEMPLATE = """
+                                    <div class="variable">
+                                        <div class="variable-name">{var.name}</div>
+                                        <div class="variable-value">Value: {var.value}</div>
+                                        <div class="variable-desc">{var.description}</div>
+                                    </div>
+    """
+_RULE_TEMPLATE = """
+                                    <div class="rule">
+                                        <div class="rule-id">Rule ID: {rule.id}</div>
+                                        <div class="rule-expr">{rule.alternate_expression}</div>
+                                    </div>
+    """
+
+# Fragments shared by the sections of every policy
+_SECTION_OPEN = """
+                            <div class="section">
+"""
+_VARIABLES_SECTION_OPEN = """
+                            <div class="section">
+                                <div class="section-title">📊 Variables</div>
+"""
+_RULES_SECTION_OPEN = """
+                            <div class="section">
+                                <div class="section-title">📋 Rules</div>
+"""
+_SECTION_CLOSE = """
+                            </div>
+"""
+
+# Single-pass HTML escaping table
+_HTML_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'})
+
+# Every report carries these, minify them once at import time
+_MINIFIED_STYLE = _minify_css(_STYLE)
+_MINIFIED_SCRIPT = _minify_js(_SCRIPT)
+
+
+def _iter_base64(file_path: Path, chunk_size: int = _B64_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Incrementally base64-encode a file, so that neither the file nor its encoding are fully held in memory.
+
+    Parameters
+    ----------
+    file_path : Path to the file to encode
+    chunk_size : Number of bytes encoded per chunk, must be a multiple of 3
+
+    Returns
+    -------
+    Iterator over the encoded chunks, which concatenated form the encoding of the whole file
+    """
+    # Reuse a single read buffer for the whole file instead of allocating a new one per chunk
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with file_path.open('rb') as src:
+        while size := src.readinto(buffer):
+            yield base64.b64encode(view[:size]).decode('ascii')
+
+
+def _b64_cache_prefix(file_path: Path) -> str:
+    """Prefix of the cached base64 encodings of a file, keyed on its name and a hash of its resolved path."""
+    path_hash = hashlib.blake2b(str(file_path.resolve()).encode(), digest_size=8).hexdigest()
+    return f'{file_path.stem}_{path_hash}_'
+
+
+def _b64_cache_path(file_path: Path) -> Path:
+    """Path of the cached base64 encoding of a file, keyed on its path, modification time and size."""
+    stat = file_path.stat()
+    return config.cache_dir / f'{_b64_cache_prefix(file_path)}{stat.st_mtime_ns}_{stat.st_size}.b64'
+
+
+def _write_base64(file_path: Path, out: TextIO) -> None:
+    """
+    Stream the base64 encoding of a file into a text stream, keeping memory usage bounded.
+    The encoding is cached to disk so that regenerating a report only needs to copy it.
+
+    Parameters
+    ----------
+    file_path : Path to the file to encode
+    out : Text stream where the encoded contents will be written
+    """
+    cache_path = _b64_cache_path(file_path)
+    if cache_path.exists():
+        with cache_path.open('r', encoding='ascii') as cached:
+            shutil.copyfileobj(cached, out)
+        return
+
+    # Write to a temporary file first so that an interrupted run never leaves a truncated cache behind
+    tmp_path = cache_path.with_suffix('.b64.tmp')
+    with tmp_path.open('w', encoding='ascii') as cache:
+        for encoded in _iter_base64(file_path):
+            out.write(encoded)
+            cache.write(encoded)
+    tmp_path.replace(cache_path)
+
+    # Remove the encodings of earlier versions of the file, which will not be used again
+    prefix = _b64_cache_prefix(file_path)
+    for stale_path in config.cache_dir.glob('*.b64'):
+        if stale_path.name.startswith(prefix) and stale_path != cache_path:
+            stale_path.unlink(missing_ok=True)
+
+
+def _markdown_renderer() -> Callable[[str], str]:
+    """
+    Create a Markdown to HTML rendering function. Many findings share the same insight text, so each
+    distinct text is only rendered once, reusing a single Markdown converter instead of building a new
+    one per call.
+    """
+    md = markdown.Markdown()
+    rendered: dict[str, str] = {}
+
+    def render(text: str) -> str:
+        html = rendered.get(text)
+        if html is None:
+            html = rendered[text] = md.reset().convert(text)
+        return html
+
+    return render
+
+
+def _render_finding(finding: ARCFinding, render_markdown: Callable[[str], str]) -> str:
+    """Render a single finding, with its insight converted from Markdown."""
+    return _FINDING_TEMPLATE.format(severity=finding.severity, insight=render_markdown(finding.insight))
+
+
+def _render_variable(var: ResolvedVariable) -> str:
+    """Render a single resolved variable."""
+    return _VARIABLE_TEMPLATE.format(var=var)
+
+
+def _render_rule(rule: ResolvedRule) -> str:
+    """Render a single rule using its alternate (natural language) expression."""
+    return _RULE_TEMPLATE.format(rule=rule)
+
+
+def _render_policy(chapter_idx: int, policy_idx: int, policy: ResolvedPolicy,
+                   render_markdown: Callable[[str], str]) -> str:
+    """
+    Render a policy entry of the navigation tree, with its findings, variables and rules.
+
+    Parameters
+    ----------
+    chapter_idx : Index of the chapter that contains the policy
+    policy_idx : Index of the policy within its chapter
+    policy : The resolved policy to render
+    render_markdown : Function converting Markdown text to HTML
+
+    Returns
+    -------
+    HTML fragment for the policy
+    """
+    # Truncate before escaping, so that no entity is cut in half
+    escaped_desc = policy.description[:200].translate(_HTML_ESCAPE)
+    parts = [_POLICY_HEADER_TEMPLATE.format(chapter_idx=chapter_idx, policy_idx=policy_idx,
+                                            name=policy.name, description=escaped_desc)]
+    # Findings section (first)
+    if policy.findings:
+        parts.append(_SECTION_OPEN)
+        parts.extend(_render_finding(finding, render_markdown) for finding in policy.findings)
+        parts.append(_SECTION_CLOSE)
+
+    # Detailed findings section (collapsible)
+    if policy.ar_assessment:
+        findings_json = to_json(policy.ar_assessment, indent=2).decode()
+        parts.append(f"""
+                            <div class="section">
+                                <details style="background: white; padding: 12px; border-radius: 4px; border-left: 3px solid #0073bb;">
+                                    <summary style="cursor: pointer; font-weight: 600; color: #232f3e;">🔍 Detailed Findings</summary>
+                                    <pre style="margin-top: 12px; background: #f8f9fa; padding: 10px; border-radius: 4px; overflow-x: auto; font-size: 12px;">{findings_json}</pre>
+                                </details>
+                            </div>
+""")
+
+    # Variables section, only those with a resolved value
+    resolved_vars = [v for v in policy.variables if v.value]
+    if resolved_vars:
+        parts.append(_VARIABLES_SECTION_OPEN)
+        parts.extend(_render_variable(var) for var in resolved_vars)
+        parts.append(_SECTION_CLOSE)
+
+    # Rules section
+    if policy.rules:
+        parts.append(_RULES_SECTION_OPEN)
+        parts.extend(_render_rule(rule) for rule in policy.rules)
+        parts.append(_SECTION_CLOSE)
+
+    parts.append("""
+                        </div>
+                    </div>
+""")
+    return ''.join(parts)
+
+
+def _render_chapter(chapter_idx: int, chapter_name: str, policies: list[ResolvedPolicy],
+                    render_markdown: Callable[[str], str]) -> str:
+    """
+    Render a chapter entry of the navigation tree, including all of its policies.
+
+    Parameters
+    ----------
+    chapter_idx : Index of the chapter in the report
+    chapter_name : Title of the chapter
+    policies : Resolved policies belonging to the chapter
+    render_markdown : Function converting Markdown text to HTML
+
+    Returns
+    -------
+    HTML fragment for the chapter
+    """
+    parts = [f"""
+            <div class="chapter" id="chapter-{chapter_idx}">
+                <div class="chapter-header" onclick="toggleChapter({chapter_idx})">
+                    📁 {chapter_name[:60]}
+                </div>
+                <div class="chapter-content">
+"""]
+    parts.extend(_render_policy(chapter_idx, policy_idx, policy, render_markdown)
+                 for policy_idx, policy in enumerate(policies))
+    parts.append("""
+                </div>
+            </div>
+""")
+    return ''.join(parts)
 
 
 def generate_html_report(spec_title: str, spec_file_path: Path,
@@ -22,89 +389,23 @@ def generate_html_report(spec_title: str, spec_file_path: Path,
     """
     chapters = {title: policies for title, policies in chapters_data}
 
-    # Encode PDFs as base64 for embedding
-    spec_pdf_b64 = base64.b64encode(spec_file_path.read_bytes()).decode('utf-8')
+    render_markdown = _markdown_renderer()
 
-    # Get proposal PDFs (assuming all policies reference the same proposals)
-    proposal_pdfs = []
+    # Get proposal PDFs (assuming all policies reference the same proposals), their contents are streamed
+    # into the report when their viewers are written
+    proposal_paths = []
     all_policies = [p for policies in chapters.values() for p in policies]
     if all_policies and all_policies[0].proposal_paths:
-        for i, prop_path in enumerate(all_policies[0].proposal_paths):
-            proposal_pdfs.append({
-                'name': prop_path.name,
-                'data': base64.b64encode(prop_path.read_bytes()).decode('utf-8')
-            })
+        proposal_paths = list(all_policies[0].proposal_paths)
 
-    html = f"""<!DOCTYPE html>
+    with output_path.open('w', encoding='utf-8') as out:
+        out.write(f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Policy Compliance Report - {spec_title}</title>
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; background: #f5f5f5; }}
-        .container {{ display: flex; height: 100vh; }}
-        .sidebar {{ width: 500px; background: white; overflow-y: auto; border-right: 1px solid #ddd; min-width: 200px; max-width: 800px; }}
-        .resizer {{ width: 5px; cursor: col-resize; background: #ddd; flex-shrink: 0; }}
-        .resizer:hover {{ background: #ff9900; }}
-        .content {{ flex: 1; display: flex; flex-direction: column; }}
-        .header {{ background: #232f3e; color: white; padding: 20px; }}
-        .header h1 {{ font-size: 24px; margin-bottom: 5px; }}
-        .header p {{ opacity: 0.8; font-size: 14px; }}
-        .documents {{ display: flex; height: calc(100vh - 80px); }}
-        .doc-panel {{ flex: 1; display: flex; flex-direction: column; border-right: 1px solid #ddd; }}
-        .doc-panel:last-child {{ border-right: none; }}
-        .doc-header {{ background: #f8f9fa; padding: 10px 15px; border-bottom: 1px solid #ddd; font-weight: 600; }}
-        .doc-viewer {{ flex: 1; background: #525252; }}
-        iframe {{ width: 100%; height: 100%; border: none; }}
-        .chapter {{ border-bottom: 1px solid #eee; }}
-        .chapter-header {{ padding: 15px; background: #f8f9fa; cursor: pointer; font-weight: 600; }}
-        .chapter-header:hover {{ background: #e9ecef; }}
-        .chapter-content {{ display: none; }}
-        .chapter.expanded .chapter-content {{ display: block; }}
-        .policy {{ border-bottom: 1px solid #f0f0f0; }}
-        .policy-header {{ padding: 12px 15px; cursor: pointer; background: white; }}
-        .policy-header:hover {{ background: #f8f9fa; }}
-        .policy-name {{ font-weight: 600; color: #232f3e; margin-bottom: 4px; }}
-        .policy-desc {{ font-size: 13px; color: #666; }}
-        .policy-content {{ display: none; padding: 15px; background: #fafafa; }}
-        .policy.expanded .policy-content {{ display: block; }}
-        .section {{ margin-bottom: 20px; }}
-        .section-title {{ font-weight: 600; color: #232f3e; margin-bottom: 8px; font-size: 14px; }}
-        .variable {{ background: white; padding: 10px; margin-bottom: 8px; border-radius: 4px; border-left: 3px solid #ff9900; }}
-        .variable-name {{ font-weight: 600; color: #232f3e; }}
-        .variable-value {{ color: #0073bb; margin-top: 4px; }}
-        .variable-desc {{ font-size: 12px; color: #666; margin-top: 4px; }}
-        .rule {{ background: white; padding: 10px; margin-bottom: 8px; border-radius: 4px; }}
-        .rule-id {{ font-weight: 600; color: #666; font-size: 12px; }}
-        .rule-expr {{ font-family: 'Courier New', monospace; font-size: 13px; margin-top: 4px; color: #232f3e; }}
-        .comments {{ background: #fff3cd; padding: 12px; border-radius: 4px; border-left: 3px solid #ffc107; }}
-        .comments-title {{ font-weight: 600; color: #856404; margin-bottom: 8px; }}
-        .comments-text {{ color: #856404; font-size: 13px; white-space: pre-wrap; }}
-        .comments-text ul, .comments-text ol {{ margin: 8px 0; padding-left: 20px; }}
-        .finding {{ padding: 12px; border-radius: 4px; margin-bottom: 8px; }}
-        .finding-success {{ background: #d4edda; border-left: 3px solid #28a745; color: #155724; }}
-        .finding-warning {{ background: #fff3cd; border-left: 3px solid #ffc107; color: #856404; }}
-        .finding-error {{ background: #f8d7da; border-left: 3px solid #dc3545; color: #721c24; }}
-        .finding-text {{ font-size: 13px; }}
-        .finding-text strong {{ font-weight: 600; }}
-        .finding-text ul {{ margin: 8px 0; padding-left: 20px; list-style-type: disc; }}
-        .finding-text ol {{ margin: 8px 0; padding-left: 20px; }}
-        .finding-text li {{ margin: 4px 0; }}
-        .tab-container {{ display: flex; background: #f8f9fa; border-bottom: 1px solid #ddd; }}
-        .tab {{ padding: 10px 20px; cursor: pointer; border-right: 1px solid #ddd; }}
-        .tab.active {{ background: white; font-weight: 600; }}
-        .tab:hover {{ background: #e9ecef; }}
-        .tab.active:hover {{ background: white; }}
-        table {{ border-collapse: collapse; width: 100%; margin: 10px 0; background: white; }}
-        th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-        th {{ background: #f8f9fa; font-weight: 600; color: #232f3e; }}
-        tr:hover {{ background: #f8f9fa; }}
-        .tooltip {{ position: relative; cursor: help; border-bottom: 1px dotted #666; }}
-        .tooltip .tooltiptext {{ visibility: hidden; width: 300px; background: #232f3e; color: white; text-align: left; border-radius: 4px; padding: 8px; position: absolute; z-index: 1; bottom: 125%; left: 50%; margin-left: -150px; opacity: 0; transition: opacity 0.3s; font-size: 12px; }}
-        .tooltip:hover .tooltiptext {{ visibility: visible; opacity: 1; }}
-    </style>
+    <style>{_MINIFIED_STYLE}</style>
 </head>
 <body>
     <div class="container">
@@ -113,186 +414,59 @@ def generate_html_report(spec_title: str, spec_file_path: Path,
                 <h1>{spec_title}</h1>
                 <p>Policy Compliance Report</p>
             </div>
-"""
-
-    # Generate chapter/policy navigation
-    for chapter_idx, (chapter_name, policies) in enumerate(chapters.items()):
-        html += f"""
-            <div class="chapter" id="chapter-{chapter_idx}">
-                <div class="chapter-header" onclick="toggleChapter({chapter_idx})">
-                    📁 {chapter_name[:60]}
-                </div>
-                <div class="chapter-content">
-"""
-        for policy_idx, policy in enumerate(policies):
-            # Escape description for HTML attribute
-            escaped_desc = policy.description.replace('"', '&quot;').replace("'", '&#39;')
-            html += f"""
-                    <div class="policy" id="policy-{chapter_idx}-{policy_idx}">
-                        <div class="policy-header" onclick="togglePolicy({chapter_idx}, {policy_idx})">
-                            <div class="policy-name">{policy.name}</div>
-                            <div class="policy-desc">{escaped_desc[:200]}</div>
-                        </div>
-                        <div class="policy-content">
-"""
-            # Findings section (first)
-            if policy.findings:
-                html += """
-                            <div class="section">
-"""
-                for finding in policy.findings:
-                    severity_class = f"finding-{finding.severity}"
-                    formatted_insight = markdown.markdown(finding.insight)
-                    html += f"""
-                                <div class="finding {severity_class}">
-                                    <div class="finding-text">{formatted_insight}</div>
-                                </div>
-"""
-                html += """
-                            </div>
-"""
-            
-            # Detailed findings section (collapsible)
-            if policy.ar_assessment:
-                findings_json = json.dumps(policy.ar_assessment, indent=2)
-                html += f"""
-                            <div class="section">
-                                <details style="background: white; padding: 12px; border-radius: 4px; border-left: 3px solid #0073bb;">
-                                    <summary style="cursor: pointer; font-weight: 600; color: #232f3e;">🔍 Detailed Findings</summary>
-                                    <pre style="margin-top: 12px; background: #f8f9fa; padding: 10px; border-radius: 4px; overflow-x: auto; font-size: 12px;">{findings_json}</pre>
-                                </details>
-                            </div>
-"""
+""")
 
-            # Variables section
-            if policy.variables and len([v for v in policy.variables if v.value]) > 0:
-                html += """
-                            <div class="section">
-                                <div class="section-title">📊 Variables</div>
-"""
-                for var in policy.variables:
-                    if var.value:
-                        html += f"""
-                                    <div class="variable">
-                                        <div class="variable-name">{var.name}</div>
-                                        <div class="variable-value">Value: {var.value}</div>
-                                        <div class="variable-desc">{var.description}</div>
-                                    </div>
-    """
-                html += """
-                            </div>
-"""
+        # Generate chapter/policy navigation
+        for chapter_idx, (chapter_name, policies) in enumerate(chapters.items()):
+            out.write(_render_chapter(chapter_idx, chapter_name, policies, render_markdown))
 
-                # Rules section
-                if policy.rules:
-                    html += """
-                                <div class="section">
-                                    <div class="section-title">📋 Rules</div>
-    """
-                    for rule in policy.rules:
-                        html += f"""
-                                    <div class="rule">
-                                        <div class="rule-id">Rule ID: {rule.id}</div>
-                                        <div class="rule-expr">{rule.alternate_expression}</div>
-                                    </div>
-    """
-                    html += """
-                                </div>
-    """
-
-            html += """
-                        </div>
-                    </div>
-"""
-
-        html += """
-                </div>
-            </div>
-"""
-
-    html += """
+        out.write("""
         </div>
         <div class="resizer" id="resizer"></div>
         <div class="content">
             <div class="tab-container">
-"""
+""")
 
-    for i, prop in enumerate(proposal_pdfs):
-        active = " active" if i == 0 else ""
-        html += f"""
-                <div class="tab{active}" onclick="switchTab({i})">{prop['name']}</div>
-"""
+        for i, prop_path in enumerate(proposal_paths):
+            active = " active" if i == 0 else ""
+            out.write(f"""
+                <div class="tab{active}" onclick="switchTab({i})">{prop_path.name}</div>
+""")
 
-    html += f"""
-                <div class="tab" onclick="switchTab({len(proposal_pdfs)})">Technical Specification</div>
+        out.write(f"""
+                <div class="tab" onclick="switchTab({len(proposal_paths)})">Technical Specification</div>
             </div>
             <div class="documents">
-"""
+""")
 
-    # Proposal viewers (first)
-    for i, prop in enumerate(proposal_pdfs):
-        display = "flex" if i == 0 else "none"
-        html += f"""
+        # Proposal viewers (first)
+        for i, prop_path in enumerate(proposal_paths):
+            display = "flex" if i == 0 else "none"
+            out.write(f"""
                 <div class="doc-panel" id="doc-{i}" style="display: {display};">
-                    <iframe src="data:application/pdf;base64,{prop['data']}"></iframe>
+                    <iframe src="data:application/pdf;base64,""")
+            _write_base64(prop_path, out)
+            out.write(""""></iframe>
                 </div>
-"""
+""")
 
-    # Technical spec viewer (last)
-    html += f"""
-                <div class="doc-panel" id="doc-{len(proposal_pdfs)}" style="display: none;">
-                    <iframe src="data:application/pdf;base64,{spec_pdf_b64}"></iframe>
+        # Technical spec viewer (last)
+        out.write(f"""
+                <div class="doc-panel" id="doc-{len(proposal_paths)}" style="display: none;">
+                    <iframe src="data:application/pdf;base64,""")
+        _write_base64(spec_file_path, out)
+        out.write(""""></iframe>
                 </div>
-"""
+""")
 
-    html += """
+        out.write(f"""
             </div>
         </div>
     </div>
     <script>
-        function toggleChapter(idx) {
-            const chapter = document.getElementById(`chapter-${idx}`);
-            chapter.classList.toggle('expanded');
-        }
-        
-        function togglePolicy(chapterIdx, policyIdx) {
-            const policy = document.getElementById(`policy-${chapterIdx}-${policyIdx}`);
-            policy.classList.toggle('expanded');
-        }
-        
-        function switchTab(idx) {
-            document.querySelectorAll('.tab').forEach((tab, i) => {
-                tab.classList.toggle('active', i === idx);
-            });
-            document.querySelectorAll('.doc-panel').forEach((panel, i) => {
-                panel.style.display = i === idx ? 'flex' : 'none';
-            });
-        }
-        
-        const resizer = document.getElementById('resizer');
-        const sidebar = document.getElementById('sidebar');
-        let isResizing = false;
-        
-        resizer.addEventListener('mousedown', (e) => {
-            isResizing = true;
-            document.body.style.cursor = 'col-resize';
-        });
-        
-        document.addEventListener('mousemove', (e) => {
-            if (!isResizing) return;
-            const newWidth = e.clientX;
-            if (newWidth >= 200 && newWidth <= 800) {
-                sidebar.style.width = newWidth + 'px';
-            }
-        });
-        
-        document.addEventListener('mouseup', () => {
-            isResizing = false;
-            document.body.style.cursor = 'default';
-        });
+{_MINIFIED_SCRIPT}
     </script>
 </body>
 </html>
-"""
+""")
 
-    output_path.write_text(html)
@@ -1,27 +1,18 @@
 """Section extraction from chapter markdown."""
 
-import json
 import logging
 from pathlib import Path
 from strands import Agent
+from concurrent.futures import ThreadPoolExecutor
 from misc.config import config
+from pydantic_core import from_json
 from strands.models import BedrockModel
 from botocore.config import Config as BotocoreConfig
-from models.technical_spec import TechnicalSpecMetadata, RawChapter, Section, SectionList
+from models.technical_spec import RawChapter, RawChapterRef, Section, SectionList
 
 logger = logging.getLogger(__name__)
 
-
-class SectionExtractor:
-    """Extracts policy-relevant sections from chapter markdown."""
-
-    def __init__(self, cache_path: Path = None):
-        model = BedrockModel(
-            model_id=config.fm_id,
-            boto_client_config=BotocoreConfig(read_timeout=180)
-        )
-
-        system_prompt = """You are an expert at analyzing technical specification documents and identifying self-contained sections that contain policy rules or technical requirements.
+SYSTEM_PROMPT = """You are an expert at analyzing technical specification documents and identifying self-contained sections that contain policy rules or technical requirements.
 
 Your task is to:
 1. Identify sections within the chapter that contain verifiable technical requirements or policy rules
@@ -39,8 +30,61 @@ Guidelines:
 
 Output a list of Section objects with proper structure."""
 
-        self.agent = Agent(model=model, system_prompt=system_prompt)
+
+class SectionExtractor:
+    """Extracts policy-relevant sections from chapter markdown."""
+
+    def __init__(self, cache_path: Path = None):
         self.cache_path = cache_path
+        self._agent = None
+        self._chapter_refs: dict[int, RawChapterRef] | None = None
+        self._section_files: dict[int, list[Path]] | None = None
+
+    @property
+    def agent(self) -> Agent:
+        """Lazy-load the extraction agent, so that it is only created when sections are not cached."""
+        if self._agent is None:
+            model = BedrockModel(
+                model_id=config.fm_id,
+                boto_client_config=BotocoreConfig(read_timeout=180)
+            )
+            self._agent = Agent(model=model, system_prompt=SYSTEM_PROMPT)
+
+        return self._agent
+
+    @property
+    def chapter_refs(self) -> dict[int, RawChapterRef]:
+        """Lazy-load the chapter references in the techspec metadata once, indexed by chapter number."""
+        if self._chapter_refs is None:
+            self._chapter_refs = {}
+            if self.cache_path and self.cache_path.exists():
+                try:
+                    # The metadata is written by this tool, so skip validating it and only build the chapter
+                    # references, which are the only part needed here
+                    cache_data = from_json(self.cache_path.read_bytes())
+                    self._chapter_refs = {c['number']: RawChapterRef.model_construct(**c)
+                                          for c in cache_data.get('chapters') or []}
+                except Exception as e:
+                    logger.warning('Failed to load techspec metadata: %s', e)
+
+        return self._chapter_refs
+
+    @property
+    def section_files(self) -> dict[int, list[Path]]:
+        """Lazy-scan the output directory once for cached section files, sorted and indexed by chapter number."""
+        if self._section_files is None:
+            # Build the index fully before keeping it, so that a failed scan is retried rather than left partial
+            files_by_chapter = {}
+            for section_file in config.output_dir.glob("chapter_*/section_*.md"):
+                chapter_suffix = section_file.parent.name.removeprefix('chapter_')
+                if not chapter_suffix.isdigit():
+                    continue
+                files_by_chapter.setdefault(int(chapter_suffix), []).append(section_file)
+            for section_files in files_by_chapter.values():
+                section_files.sort()
+            self._section_files = files_by_chapter
+
+        return self._section_files
 
     def extract_sections(self, chapter: RawChapter) -> list[Section]:
         """
@@ -55,39 +99,34 @@ Output a list of Section objects with proper structure."""
         List of Section objects
         """
         # Try loading from techspec metadata if available
-        if self.cache_path and self.cache_path.exists():
+        chapter_ref = self.chapter_refs.get(chapter.number)
+        if chapter_ref and chapter_ref.sections_extracted:
             try:
-                cache_data = json.loads(self.cache_path.read_text())
-                metadata = TechnicalSpecMetadata(**cache_data)
-
-                # Find chapter in metadata
-                if metadata.chapters:
-                    chapter_ref = next((c for c in metadata.chapters if c.number == chapter.number), None)
-                    if chapter_ref and chapter_ref.sections_extracted:
-                        # Load sections by scanning the chapter directory
-                        chapter_dir = config.output_dir / f"chapter_{chapter.number:02d}"
-                        if chapter_dir.exists():
-                            sections = []
-                            section_files = sorted(chapter_dir.glob("section_*.md"))
-                            
-                            for section_file in section_files:
-                                section_id = f"ch{chapter.number}_{section_file.stem}"
-                                section = Section(
-                                    id=section_id,
-                                    title=section_file.stem.replace('_', ' ').title(),
-                                    chapter_number=chapter.number,
-                                    markdown_contents=section_file.read_text()
-                                )
-                                sections.append(section)
-                            
-                            if sections:
-                                logger.info(f'Loaded {len(sections)} sections from cache for chapter {chapter.number}')
-                                return sections
+                section_files = self.section_files.get(chapter.number, [])
+                sections = []
+
+                # Overlap the file reads, but keep the model validation in this thread
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    contents = list(executor.map(lambda f: f.read_text(encoding='utf-8'), section_files))
+
+                for section_file, markdown_contents in zip(section_files, contents):
+                    section_id = f"ch{chapter.number}_{section_file.stem}"
+                    section = Section(
+                        id=section_id,
+                        title=section_file.stem.replace('_', ' ').title(),
+                        chapter_number=chapter.number,
+                        markdown_contents=markdown_contents
+                    )
+                    sections.append(section)
+
+                if sections:
+                    logger.info('Loaded %d sections from cache for chapter %d', len(sections), chapter.number)
+                    return sections
             except Exception as e:
-                logger.warning(f'Failed to load sections from techspec metadata: {e}')
+                logger.warning('Failed to load sections from techspec metadata: %s', e)
 
         # Extract sections using agent
-        logger.info(f'Extracting sections from chapter {chapter.number}: {chapter.title}')
+        logger.info('Extracting sections from chapter %d: %s', chapter.number, chapter.title)
 
         prompt = f"""Analyze the following chapter and extract self-contained sections that contain policy rules or technical requirements.
 
@@ -107,6 +146,6 @@ Extract sections with clear boundaries and rationale. Each section should have:
 Return a list of Section objects."""
 
         sections = self.agent(prompt, structured_output_model=SectionList).structured_output.sections
-        logger.info(f'Extracted {len(sections)} sections for chapter {chapter.number}')
+        logger.info('Extracted %d sections for chapter %d', len(sections), chapter.number)
 
         return sections
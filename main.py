@@ -3,7 +3,7 @@
 import logging
 from pathlib import Path
 from misc.config import config
-from policies.documents import TechnicalSpec
+from policies.documents import get_spec
 
 # Configure the root strands logger
 # logging.getLogger("strands").setLevel(logging.DEBUG)
@@ -16,7 +16,7 @@ logging.basicConfig(format="%(levelname)s | %(name)s | %(message)s",
 def extract_sections(spec_path: Path, output_dir: Path):
     """Convert technical specification PDF to Markdown and extract sections."""
     config.output_dir = output_dir
-    doc = TechnicalSpec(file_path=spec_path)
+    doc = get_spec(spec_path)
     print(f"Sections extracted to: {output_dir}")
     for i, chapter in enumerate(doc.chapters):
         print(f'\tChapter {i + 1} ({len(chapter.sections)} sections): {chapter.title}')
@@ -25,7 +25,7 @@ def extract_sections(spec_path: Path, output_dir: Path):
 def create_policies(spec_path: Path, transcription_dir: Path):
     """Extract formal policies from technical specification and store in Bedrock service."""
     config.output_dir = transcription_dir
-    doc = TechnicalSpec(file_path=spec_path)
+    doc = get_spec(spec_path)
 
     # Access chapters to trigger policy creation
     for chapter in doc.chapters:
@@ -39,7 +39,7 @@ def create_policies(spec_path: Path, transcription_dir: Path):
 def evaluate_proposal(spec_path: Path, proposal_paths: list[Path], output_path: Path, transcription_dir: Path):
     """Evaluate proposals against technical specification and generate HTML compliance report."""
     config.output_dir = transcription_dir
-    doc = TechnicalSpec(file_path=spec_path)
+    doc = get_spec(spec_path)
 
     resolved_policies = doc.check_compliance(proposal_paths)
     doc.to_html_report(resolved_policies, output_path)
@@ -3,6 +3,9 @@ from pathlib import Path
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field, field_validator
 
+# Directories already created by this process
+_ensured_dirs: set[Path] = set()
+
 
 class AppConfig(BaseModel):
     """Application-specific configuration."""
@@ -15,6 +18,9 @@ class AppConfig(BaseModel):
     # Document Processing
     max_document_size_mb: float = Field(default_factory=lambda: float(os.getenv('MAX_DOCUMENT_SIZE_MB', '4.5')))
 
+    # Number of sections of a chapter whose policies are built concurrently
+    section_parallelism: int = Field(default_factory=lambda: int(os.getenv('SECTION_PARALLELISM', '4')), ge=1)
+
     # Logging Configuration
     log_level: str = Field(default_factory=lambda: os.getenv('LOG_LEVEL', 'INFO'))
     log_format: str = Field(
@@ -29,8 +35,12 @@ class AppConfig(BaseModel):
     @field_validator('cache_dir', 'output_dir', mode='after')
     @classmethod
     def create_directory(cls, v: Path) -> Path:
+        # Assignments are validated too, only hit the filesystem the first time a directory is seen
+        if v in _ensured_dirs:
+            return v
         try:
             v.mkdir(parents=True, exist_ok=True)
+            _ensured_dirs.add(v)
             return v
         except Exception as e:
             raise ValueError(f"Cannot create directory {v}: {e}")
@@ -1,21 +1,81 @@
-import json
 import uuid
-import boto3
 import hashlib
 import logging
+import threading
 from pathlib import Path
 from strands import Agent
-from typing import Literal
+from typing import ClassVar, Literal
 from typing import Optional
 from datetime import datetime
+from functools import cached_property, lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from misc.config import config
-from models.bedrock import Guardrail
+from models.bedrock import Guardrail, get_bedrock_client
 from models.findings import ARCFinding
+from pydantic_core import to_json
 from pydantic import BaseModel, Field, PrivateAttr, create_model
 from strands.types.content import ContentBlock, CachePoint
 
 logger = logging.getLogger(__name__)
 
+# Regional guardrail inference profile, determined once since the region is fixed for the whole run
+_REGION_MAP = {'us': 'us', 'eu': 'eu', 'ap': 'ap'}
+_GUARDRAIL_PROFILE = f"{_REGION_MAP.get(config.region.split('-')[0], 'US')}.guardrail.v1:0"
+
+
+def _read_unbuffered(path: Path) -> bytes:
+    """Read a whole file in one go, bypassing the buffering layer that a single full read does not need."""
+    with path.open('rb', buffering=0) as f:
+        return f.read()
+
+
+@lru_cache(maxsize=128)
+def _literal_of(values: tuple[str, ...]):
+    """Optional literal type over the given values, shared by all variables using the same custom type."""
+    return Literal[values] | None
+
+
+# Serializes the proposal document reads, so that concurrent policy evaluations wait for a single read of the documents
+# instead of all missing the cache and reading them at the same time
+_proposal_docs_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4)
+def _proposal_doc_blocks(proposal_paths: tuple[Path, ...],
+                         file_stamps: tuple[tuple[int, int], ...]) -> tuple[str, tuple[ContentBlock, ...]]:
+    """
+    Read the proposal documents and build the prompt blocks that carry them, followed by a cache point so that
+    the same document prefix is reused by every policy resolved against them.
+
+    Parameters
+    ----------
+    proposal_paths : Paths of the proposal PDF documents
+    file_stamps : Modification time & size of each document, so that changed documents are read again
+
+    Returns
+    -------
+    BLAKE2b digest of the documents contents, and the document prompt blocks
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(len(proposal_paths), 8))) as executor:
+        proposal_bytes = list(executor.map(_read_unbuffered, proposal_paths))
+
+    # This is only a local cache key, so a short BLAKE2b digest is enough
+    proposal_hash = hashlib.blake2b(digest_size=16)
+    blocks = []
+    n_docs = len(proposal_paths)
+    for i, data in enumerate(proposal_bytes, 1):
+        proposal_hash.update(data)
+        name = f'Proposal doc_{i}'
+        blocks.extend([ContentBlock(document={'format': 'pdf',
+                                              'name': name,
+                                              'source': {'bytes': data}}),
+                       ContentBlock(text=f'"{name}" contains the vendor-supplied proposal '
+                                         f'(part {i}/{n_docs}) that should be used as the source of '
+                                         'truth for extracting the values of the parameters below.')])
+    blocks.append(ContentBlock(cachePoint=CachePoint(type='default')))
+
+    return proposal_hash.hexdigest(), tuple(blocks)
+
 
 class TypeValue(BaseModel):
     value: str = Field(..., description='The actual value or identifier for this type value',
@@ -69,7 +129,9 @@ class Policy(BaseModel):
     types: list[BaseType]
     variables: list[Variable]
     rules: list[Rule]
+    chapter_number: int | None = None
     _guardrail: Guardrail | None = None
+    _vars_models: ClassVar[dict[str, type[BaseModel]]] = {}
 
     @property
     def versioned_arn(self):
@@ -84,17 +146,20 @@ class Policy(BaseModel):
         """
         Resolve the values of the variables in the policy by querying the technical spec document(s)
         """
-        # Calculate cache key from proposal contents & policy definition hash
-        proposal_hash = hashlib.sha512(b''.join(p.read_bytes() for p in proposal_paths)).hexdigest()
-        hash_key = hashlib.sha512(f'{proposal_hash}_{self.id}'.encode()).hexdigest()
-        cache_path = config.cache_dir / f'resolved_policy_{hash_key}.json'
+        # Calculate cache key from proposal contents & policy definition hash. The proposals are shared by all the
+        # policies being evaluated, so they are only read again when they change on disk
+        file_stamps = tuple((st.st_mtime_ns, st.st_size) for st in (p.stat() for p in proposal_paths))
+        with _proposal_docs_lock:
+            proposal_digest, doc_blocks = _proposal_doc_blocks(tuple(proposal_paths), file_stamps)
+        hash_key = hashlib.blake2b(f'{proposal_digest}_{self.id}'.encode(), digest_size=16).hexdigest()
+        cache_path = config.cache_dir / f'resolved_policy_b2_{hash_key}.json'
 
         # Try loading from cache
         if cache_path.exists():
             try:
-                cache_data = json.loads(cache_path.read_text())
+                resolved_policy = ResolvedPolicy.model_validate_json(cache_path.read_bytes())
                 logger.debug(f'Loaded resolved policy from cache: {cache_path}')
-                return ResolvedPolicy(**cache_data)
+                return resolved_policy
             except Exception as e:
                 logger.warning(f'Failed to load cache: {e}')
 
@@ -114,17 +179,7 @@ class Policy(BaseModel):
 
         # Resolve variables
         vars_model = self._vars_to_model()
-        prompt = []
-        n_docs = len(proposal_paths)
-        for i, p in enumerate(proposal_paths, 1):
-            name = f'Proposal doc_{i}'
-            prompt.extend([ContentBlock(document={'format': 'pdf',
-                                                  'name': name,
-                                                  'source': {'bytes': p.read_bytes()}}),
-                           ContentBlock(text=f'"{name}" contains the vendor-supplied proposal '
-                                             f'(part {i}/{n_docs}) that should be used as the source of '
-                                             'truth for extracting the values of the parameters below.')])
-        prompt.append(ContentBlock(cachePoint=CachePoint(type='default')))
+        prompt = list(doc_blocks)
         prompt.append(ContentBlock(text='Extract the values of the proposal parameters in the context '
                                         'of a policy evaluating the following aspects of an associated '
                                         'technical specification:\n\n'
@@ -145,27 +200,36 @@ class Policy(BaseModel):
                                                       description=var.description,
                                                       value=f'{value}'))
 
-        resolved_rules = [ResolvedRule(id=rule.id,
-                                       expression=rule.expression,
-                                       alternate_expression=rule.alternate_expression,
-                                       variables=[rv for rv in resolved_vars if rv.name in rule.expression.split()])
-                          for rule in self.rules]
+        # Attribute variables to rules by looking up their names in the tokens of each rule expression, keeping the
+        # order of the policy variables like from_service_response does
+        resolved_rules = []
+        for rule in self.rules:
+            tokens = set(rule.expression.split())
+            resolved_rules.append(ResolvedRule(id=rule.id,
+                                               expression=rule.expression,
+                                               alternate_expression=rule.alternate_expression,
+                                               variables=[rv for rv in resolved_vars if rv.name in tokens]))
 
         resolved_policy = ResolvedPolicy(name=self.name, arn=self.arn, id=self.id, description=self.description,
                                          definition_hash=self.definition_hash, version=self.version,
                                          types=self.types, variables=resolved_vars,
-                                         rules=resolved_rules, proposal_paths=proposal_paths)
+                                         rules=resolved_rules, chapter_number=self.chapter_number,
+                                         proposal_paths=proposal_paths)
 
         # Save to cache
         try:
-            cache_path.write_text(resolved_policy.model_dump_json(indent=2))
+            cache_path.write_bytes(to_json(resolved_policy))
             logger.debug(f'Saved resolved policy to cache: {cache_path}')
         except Exception as e:
             logger.warning(f'Failed to save cache: {e}')
 
         return resolved_policy
 
-    def _vars_to_model(self) -> BaseModel:
+    def _vars_to_model(self) -> type[BaseModel]:
+        # The variables & types are fully determined by the definition hash, so reuse the model built for it
+        if (vars_model := self._vars_models.get(self.definition_hash)) is not None:
+            return vars_model
+
         # Create a custom model, we'll use that for extracting the values of the variables
         kwargs = {}
         type_map = {'BOOL': bool, 'INT': int, 'NUMBER': float}
@@ -181,14 +245,18 @@ class Policy(BaseModel):
                     default_value = default_value[0]
                 else:
                     default_value = None
-                kwargs[var.name] = (Literal[tuple(var_values)] | None,
+                kwargs[var.name] = (_literal_of(tuple(var_values)),
                                     Field(description=var.description, default=default_value))
-        return create_model('ProposalParameters', **kwargs)
+        vars_model = create_model('ProposalParameters', **kwargs)
+        self._vars_models[self.definition_hash] = vars_model
+
+        return vars_model
 
     @classmethod
     def from_service_response(cls,
                               metadata: dict[str, str | int | datetime],
-                              definition: dict[str, str | list[dict[str, str]]]):
+                              definition: dict[str, str | list[dict[str, str]]],
+                              chapter_number: int | None = None):
         """Create Policy from Bedrock service get_automated_reasoning_policy response."""
         name = metadata['name']
         _id = metadata['policyId']
@@ -207,11 +275,13 @@ class Policy(BaseModel):
         variables = [Variable(name=var['name'], type=types[var['type']], description=var['description'])
                      for var in definition.get('variables', [])]
 
-        rules = [Rule(id=rule['id'],
-                      expression=rule['expression'],
-                      alternate_expression=rule['alternateExpression'],
-                      variables=[v for v in variables if v.name in rule['expression'].split()])
-                 for rule in definition.get('rules', [])]
+        rules = []
+        for rule in definition.get('rules', []):
+            tokens = set(rule['expression'].split())
+            rules.append(Rule(id=rule['id'],
+                              expression=rule['expression'],
+                              alternate_expression=rule['alternateExpression'],
+                              variables=[v for v in variables if v.name in tokens]))
 
         return cls(name=name,
                    arn=arn,
@@ -221,35 +291,33 @@ class Policy(BaseModel):
                    version=version,
                    types=list(types.values()),
                    variables=variables,
-                   rules=rules)
+                   rules=rules,
+                   chapter_number=chapter_number)
 
     @property
     def guardrail(self) -> Guardrail:
         """
-        Create a Bedrock Guardrail that references this policy.
+        Create a Bedrock Guardrail that references this policy. The caller is responsible for deleting it, a new
+        guardrail is created on the next access once it has been deleted.
 
         Returns
         -------
         Guardrail object containing the guardrail details
         """
-        if self._guardrail is not None:
+        if self._guardrail is not None and not self._guardrail.deleted:
             return self._guardrail
 
-        bedrock_client = boto3.client('bedrock', region_name=config.region)
-
-        # Determine regional inference profile based on region
-        region_prefix = config.region.split('-')[0]
-        region_map = {'us': 'us', 'eu': 'eu', 'ap': 'ap'}
+        bedrock_client = get_bedrock_client(config.region)
 
         response = bedrock_client.create_guardrail(
-            name=f'{uuid.uuid7().hex}',
+            name=f'{uuid.uuid4().hex}',
             description=f'Guardrail for policy: {self.description}'[:200],
             automatedReasoningPolicyConfig={
                 'policies': [self.versioned_arn],
                 'confidenceThreshold': 1.0
             },
             crossRegionConfig={
-                'guardrailProfileIdentifier': f"{region_map.get(region_prefix, 'US')}.guardrail.v1:0"
+                'guardrailProfileIdentifier': _GUARDRAIL_PROFILE
             },
             blockedInputMessaging=f'Policy {self.name} violated in input prompt',
             blockedOutputsMessaging=f'Policy {self.name} violated in response'
@@ -282,6 +350,11 @@ class ResolvedRule(BaseModel):
     alternate_expression: str = Field(..., min_length=1, description='Alternative version of the rule')
     variables: list[ResolvedVariable] = Field(..., description='List of variables that are part of this rule')
 
+    @cached_property
+    def assessed_variables(self) -> list[ResolvedVariable]:
+        """Variables of the rule, without the synthetic full-policy compliance flag."""
+        return [v for v in self.variables if v.name != 'IsCompliantWithFullPolicy']
+
 
 class ResolvedPolicy(Policy):
     """
@@ -294,6 +367,11 @@ class ResolvedPolicy(Policy):
     ar_assessment: list[dict] | None = None
     _findings: Optional[list[ARCFinding]] = PrivateAttr(default=None)
 
+    @cached_property
+    def _rules_by_id(self) -> dict[str, ResolvedRule]:
+        """Index of the resolved rules by their identifier."""
+        return {rule.id: rule for rule in self.rules}
+
     @property
     def findings(self) -> list[ARCFinding]:
         """Parse ar_assessment into structured findings after initialization."""
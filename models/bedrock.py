@@ -1,15 +1,53 @@
 import boto3
 import logging
+import functools
 import botocore.exceptions
-from pydantic import BaseModel
+from botocore.config import Config
+from pydantic import BaseModel, PrivateAttr
 from misc.config import config
 
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=4)
+def get_bedrock_client(region: str):
+    """
+    Get a Bedrock control plane client for the given region, creating it only once
+
+    Parameters
+    ----------
+    region : AWS region of the client
+    """
+    return boto3.client('bedrock', region_name=region)
+
+
+@functools.lru_cache(maxsize=4)
+def get_bedrock_runtime_client(region: str):
+    """
+    Get a Bedrock runtime client for the given region, creating it only once
+
+    Parameters
+    ----------
+    region : AWS region of the client
+    """
+    return boto3.client('bedrock-runtime', region_name=region,
+                        config=Config(max_pool_connections=32, retries={'max_attempts': 5, 'mode': 'adaptive'}))
+
+
+@functools.lru_cache(maxsize=4)
+def get_tagging_client(region: str):
+    """
+    Get a Resource Groups Tagging API client for the given region, creating it only once
+
+    Parameters
+    ----------
+    region : AWS region of the client
+    """
+    return boto3.client('resourcegroupstaggingapi', region_name=region)
+
 
 class Guardrail(BaseModel):
     """
-    Container for Bedrock Guardrail details
+    Container for Bedrock Guardrail details. Use it as a context manager to delete the guardrail once done with it
     """
     id: str
     arn: str
@@ -17,14 +55,30 @@ class Guardrail(BaseModel):
     policy_arn: str
     confidence_threshold: float
 
-    def __del__(self):
+    _deleted: bool = PrivateAttr(default=False)
+
+    @property
+    def deleted(self) -> bool:
+        """Whether the guardrail has already been deleted from the service."""
+        return self._deleted
+
+    def __enter__(self) -> 'Guardrail':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.delete()
+
+    def delete(self):
         """
-        Delete the guardrail automatically when the object is being deleted
+        Delete the guardrail, if it has not been deleted already
         """
-        logger.debug(f'Automatically cleaning up guardrail {self.id}')
-        bedrock_client = boto3.client('bedrock', region_name=config.region)
+        if self._deleted:
+            return
+
+        self._deleted = True
+        logger.debug(f'Cleaning up guardrail {self.id}')
         try:
-            bedrock_client.delete_guardrail(guardrailIdentifier=self.id)
+            get_bedrock_client(config.region).delete_guardrail(guardrailIdentifier=self.id)
         except botocore.exceptions.ClientError as e:
-            logging.warning(f'Error cleaning up Guardrail {self.id}, skipping')
-            logging.exception(e)
+            logger.warning(f'Error cleaning up Guardrail {self.id}, skipping')
+            logger.exception(e)
@@ -1,6 +1,7 @@
 """Pydantic models for Bedrock Automated Reasoning assessment findings."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+from functools import cached_property
 from typing import Any, TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -9,31 +10,33 @@ if TYPE_CHECKING:
 
 class GuardrailAutomatedReasoningRule(BaseModel):
     """Represents a policy rule in automated reasoning."""
-    model_config = {"extra": "allow"}
+    model_config = {"extra": "allow", "defer_build": True}
 
 
 class GuardrailAutomatedReasoningLogicWarning(BaseModel):
     """Indication of a logic issue with the translation."""
-    model_config = {"extra": "allow"}
+    model_config = {"extra": "allow", "defer_build": True}
 
 
 class GuardrailAutomatedReasoningTranslation(BaseModel):
     """Logical translation of natural language input."""
-    model_config = {"extra": "allow"}
+    model_config = {"extra": "allow", "defer_build": True}
 
 
 class GuardrailAutomatedReasoningScenario(BaseModel):
     """Scenario demonstrating logical outcomes."""
-    model_config = {"extra": "allow"}
+    model_config = {"extra": "allow", "defer_build": True}
 
 
 class GuardrailAutomatedReasoningTranslationOption(BaseModel):
     """One possible logical interpretation of ambiguous input."""
+    model_config = {"defer_build": True}
     examples: list[GuardrailAutomatedReasoningTranslation] | None = None
 
 
 class ImpossibleFinding(BaseModel):
     """No valid claims can be made due to logical contradictions."""
+    model_config = {"defer_build": True}
     contradicting_rules: list[GuardrailAutomatedReasoningRule] | None = Field(None, alias="contradictingRules")
     logic_warning: GuardrailAutomatedReasoningLogicWarning | None = Field(None, alias="logicWarning")
     translation: GuardrailAutomatedReasoningTranslation | None = None
@@ -46,6 +49,7 @@ class ImpossibleFinding(BaseModel):
 
 class InvalidFinding(BaseModel):
     """Claims are logically false and contradict established rules."""
+    model_config = {"defer_build": True}
     contradicting_rules: list[GuardrailAutomatedReasoningRule] | None = Field(None, alias="contradictingRules")
     logic_warning: GuardrailAutomatedReasoningLogicWarning | None = Field(None, alias="logicWarning")
     translation: GuardrailAutomatedReasoningTranslation | None = None
@@ -54,14 +58,14 @@ class InvalidFinding(BaseModel):
     @property
     def insight(self) -> str:
         if self.contradicting_rules:
-            msg = ''
+            parts = []
             for contradicting_rule in self.contradicting_rules:
-                rule = [r for r in self._parent_policy.rules
-                        if r.id == contradicting_rule.identifier][0]
-                msg += f'- **{rule.id}**: {rule.alternate_expression}\n'
-                msg += '\n'.join(
-                    [f'    + **{r.name}**: {"**" + r.value + "**" if r.value else "*Unknown*"} ({r.description})'
-                     for r in rule.variables if r.name != 'IsCompliantWithFullPolicy'])
+                rule = self._parent_policy._rules_by_id[contradicting_rule.identifier]
+                parts.append(f'- **{rule.id}**: {rule.alternate_expression}\n')
+                parts.extend(
+                    f'    + **{r.name}**: {"**" + r.value + "**" if r.value else "*Unknown*"} ({r.description})\n'
+                    for r in rule.assessed_variables)
+            msg = ''.join(parts)
             plural = 's' if len(self.contradicting_rules) > 1 else ''
             return f"❌ **Non-Compliant**: The proposal appears to violate the following rule{plural}:\n\n{msg}"
         return "❌ **Non-Compliant**: The proposal does not satisfy the policy requirements."
@@ -69,7 +73,7 @@ class InvalidFinding(BaseModel):
 
 class NoTranslationsFinding(BaseModel):
     """No relevant logical information could be extracted."""
-    model_config = {"extra": "allow"}
+    model_config = {"extra": "allow", "defer_build": True}
     _parent_policy: Any = None
 
     @property
@@ -79,6 +83,7 @@ class NoTranslationsFinding(BaseModel):
 
 class SatisfiableFinding(BaseModel):
     """Claims could be true or false depending on additional assumptions."""
+    model_config = {"defer_build": True}
     claims_false_scenario: GuardrailAutomatedReasoningScenario | None = Field(None, alias="claimsFalseScenario")
     claims_true_scenario: GuardrailAutomatedReasoningScenario | None = Field(None, alias="claimsTrueScenario")
     logic_warning: GuardrailAutomatedReasoningLogicWarning | None = Field(None, alias="logicWarning")
@@ -93,7 +98,7 @@ class SatisfiableFinding(BaseModel):
 
 class TooComplexFinding(BaseModel):
     """Input exceeds processing capacity due to volume or complexity."""
-    model_config = {"extra": "allow"}
+    model_config = {"extra": "allow", "defer_build": True}
     _parent_policy: Any = None
 
     @property
@@ -104,6 +109,7 @@ class TooComplexFinding(BaseModel):
 
 class TranslationAmbiguousFinding(BaseModel):
     """Input has multiple valid logical interpretations."""
+    model_config = {"defer_build": True}
     difference_scenarios: list[GuardrailAutomatedReasoningScenario] | None = Field(None, alias="differenceScenarios")
     options: list[GuardrailAutomatedReasoningTranslationOption] | None = None
     _parent_policy: Any = None
@@ -119,6 +125,7 @@ class TranslationAmbiguousFinding(BaseModel):
 
 class ValidFinding(BaseModel):
     """Claims are definitively true and logically implied by premises."""
+    model_config = {"defer_build": True}
     claims_true_scenario: GuardrailAutomatedReasoningScenario | None = Field(None, alias="claimsTrueScenario")
     logic_warning: GuardrailAutomatedReasoningLogicWarning | None = Field(None, alias="logicWarning")
     supporting_rules: list[GuardrailAutomatedReasoningRule] | None = Field(None, alias="supportingRules")
@@ -136,7 +143,7 @@ class ValidFinding(BaseModel):
 
 class NotApplicableFinding(BaseModel):
     """Policy does not apply to this proposal (no variables resolved)."""
-    model_config = {"extra": "allow"}
+    model_config = {"extra": "allow", "defer_build": True}
     _parent_policy: Any = None
 
     @property
@@ -144,8 +151,21 @@ class NotApplicableFinding(BaseModel):
         return "ℹ️ **Not Applicable**: Could not extract any findings related to the policy. Maybe it does not apply?"
 
 
+# Finding fields of ARCFinding, in the order in which they take precedence
+_FINDING_TYPES = ('not_applicable', 'impossible', 'invalid', 'no_translations', 'satisfiable', 'too_complex',
+                  'translation_ambiguous', 'valid')
+
+# Severity of each type of finding, any other type (impossible, invalid, too_complex) is an error
+_TYPE_TO_SEVERITY = {'valid': 'success',
+                     'not_applicable': 'warning',
+                     'satisfiable': 'warning',
+                     'translation_ambiguous': 'warning',
+                     'no_translations': 'warning'}
+
+
 class ARCFinding(BaseModel):
     """Union type for all possible ARc assessment findings."""
+    model_config = {"defer_build": True}
     not_applicable: NotApplicableFinding | None = Field(None, alias="notApplicable")
     impossible: ImpossibleFinding | None = None
     invalid: InvalidFinding | None = None
@@ -156,62 +176,32 @@ class ARCFinding(BaseModel):
     valid: ValidFinding | None = None
     parent_policy: Any = Field(None, exclude=True)
 
+    _type: str = PrivateAttr(default='unknown')
+
     def model_post_init(self, __context):
-        """Propagate parent policy reference to child findings."""
-        if self.parent_policy:
-            for finding in [self.not_applicable, self.impossible, self.invalid, self.no_translations,
-                            self.satisfiable, self.too_complex, self.translation_ambiguous, self.valid]:
-                if finding:
+        """Determine the type of finding present and propagate parent policy reference to it."""
+        # An assessment only carries one type of finding
+        for finding_type in _FINDING_TYPES:
+            finding = getattr(self, finding_type)
+            if finding is not None:
+                self._type = finding_type
+                if self.parent_policy:
                     finding._parent_policy = self.parent_policy
+                break
 
     @property
     def finding_type(self) -> str:
         """Return the type of finding present."""
-        if self.not_applicable:
-            return "not_applicable"
-        elif self.impossible:
-            return "impossible"
-        elif self.invalid:
-            return "invalid"
-        elif self.no_translations:
-            return "no_translations"
-        elif self.satisfiable:
-            return "satisfiable"
-        elif self.too_complex:
-            return "too_complex"
-        elif self.translation_ambiguous:
-            return "translation_ambiguous"
-        elif self.valid:
-            return "valid"
-        return "unknown"
+        return self._type
 
     @property
     def severity(self) -> str:
         """Return severity level: success, warning, or error."""
-        if self.valid:
-            return "success"
-        elif self.not_applicable or self.satisfiable or self.translation_ambiguous or self.no_translations:
-            return "warning"
-        else:  # impossible, invalid, too_complex
-            return "error"
+        return _TYPE_TO_SEVERITY.get(self._type, "error")
 
-    @property
+    @cached_property
     def insight(self) -> str:
         """Get human-readable insight for this finding."""
-        if self.not_applicable:
-            return self.not_applicable.insight
-        elif self.impossible:
-            return self.impossible.insight
-        elif self.invalid:
-            return self.invalid.insight
-        elif self.no_translations:
-            return self.no_translations.insight
-        elif self.satisfiable:
-            return self.satisfiable.insight
-        elif self.too_complex:
-            return self.too_complex.insight
-        elif self.translation_ambiguous:
-            return self.translation_ambiguous.insight
-        elif self.valid:
-            return self.valid.insight
-        return "No finding available"
+        if self._type == "unknown":
+            return "No finding available"
+        return getattr(self, self._type).insight
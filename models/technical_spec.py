@@ -1,7 +1,12 @@
 import uuid
+import hashlib
+from pathlib import Path
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from models.arc import Policy
+from misc.config import config
 from datetime import date, datetime
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
@@ -9,6 +14,30 @@ if TYPE_CHECKING:
     from data_io.section_extraction import SectionExtractor
 
 
+class stored_property:
+    """
+    Property computed on first access and stored in the `_cache` dictionary of the instance. It can also be
+    assigned, which stores the assigned value instead.
+    """
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.name = fn.__name__
+        self.__doc__ = fn.__doc__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return instance._cache[self.name]
+        except KeyError:
+            value = instance._cache[self.name] = self.fn(instance)
+            return value
+
+    def __set__(self, instance, value):
+        instance._cache[self.name] = value
+
+
 class DocumentMetadata(BaseModel):
     """
     Class containing the basic metadata for a document
@@ -40,31 +69,93 @@ class TechnicalSpecMetadata(BaseModel):
                                                         description="Map of section_id -> processing_complete")
     chapter_policies_generated: dict[int, bool] = Field(default_factory=dict,
                                                         description="Map of chapter_number -> processing_complete")
+    chapter_has_policies: dict[int, bool] = Field(default_factory=dict,
+                                                  description="Map of chapter_number -> policies found in service")
     created_at: datetime = Field(default_factory=lambda: datetime.now())
     updated_at: datetime = Field(default_factory=lambda: datetime.now())
     _save_callback: callable = None
+    _dirty: bool = False
+    _batch_depth: int = 0
+
+    @staticmethod
+    def compute_file_hash(file_path: Path) -> str:
+        """
+        Compute the SHA-512 hash of a file, streaming its contents instead of reading it all at once.
+
+        Parameters
+        ----------
+        file_path : Path of the file to hash
+
+        Returns
+        -------
+        Hex digest of the file contents
+        """
+        with file_path.open('rb') as f:
+            return hashlib.file_digest(f, 'sha512').hexdigest()
 
     def set_save_callback(self, callback: callable) -> None:
         """Set callback function to save metadata after updates."""
         self._save_callback = callback
 
+    def _changed(self) -> None:
+        """Record an update, saving it right away unless a batch of updates is in progress."""
+        self.updated_at = datetime.now()
+        self._dirty = True
+        if self._batch_depth == 0:
+            self.flush()
+
+    def flush(self) -> None:
+        """Save pending updates, if any."""
+        if self._dirty and self._save_callback:
+            self._save_callback()
+        self._dirty = False
+
+    @contextmanager
+    def batch(self):
+        """Defer saving updates until the outermost batch exits, even if it exits with an error."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+
     def mark_chapter_processed(self, chapter_number: int) -> None:
         """Mark a chapter as fully processed (policies created in service)."""
         self.chapter_policies_generated[chapter_number] = True
-        self.updated_at = datetime.now()
-        if self._save_callback:
-            self._save_callback()
+        self._changed()
 
     def is_chapter_processed(self, chapter_number: int) -> bool:
         """Check if a chapter has been processed."""
         return self.chapter_policies_generated.get(chapter_number, False)
 
+    def set_chapter_has_policies(self, chapter_number: int, has_policies: bool) -> None:
+        """Record whether the service holds policies for a processed chapter, only chapters without are stored."""
+        if has_policies:
+            self.clear_chapter_has_policies(chapter_number)
+        elif self.chapter_has_policies.get(chapter_number) is not False:
+            self.chapter_has_policies[chapter_number] = False
+            self._changed()
+
+    def clear_chapter_has_policies(self, chapter_number: int | None = None) -> None:
+        """Forget that a chapter, or all chapters if none is given, had no policies in the service."""
+        if chapter_number is None:
+            changed = bool(self.chapter_has_policies)
+            self.chapter_has_policies.clear()
+        else:
+            changed = self.chapter_has_policies.pop(chapter_number, None) is not None
+        if changed:
+            self._changed()
+
+    def has_any_policies(self, chapter_number: int) -> bool:
+        """Check if a chapter may have policies in the service, which is only ruled out once recorded."""
+        return self.chapter_has_policies.get(chapter_number, True)
+
     def mark_section_processed(self, section_id: str) -> None:
         """ Mark a section as fully processed (single policy correctly created in service)."""
         self.section_policies_generated[section_id] = True
-        self.updated_at = datetime.now()
-        if self._save_callback:
-            self._save_callback()
+        self._changed()
 
     def is_section_processed(self, section_id: str) -> bool:
         """Check if a section has been processed."""
@@ -117,7 +208,7 @@ class RawChapterRef(BaseModel):
 
 
 class Chapter(BaseModel):
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    model_config = ConfigDict(arbitrary_types_allowed=True, ignored_types=(stored_property,))
 
     title: str
     number: int
@@ -125,43 +216,79 @@ class Chapter(BaseModel):
     policy_builder: Any
     metadata: TechnicalSpecMetadata | None
     section_extractor: Any = None
-    _sections: list[Section] | None = None
-    _policies: list[Policy] | None = None
+    _cache: dict[str, Any] = PrivateAttr(default_factory=dict)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Pydantic does not forward assignments to custom descriptors
+        if isinstance(getattr(type(self), name, None), stored_property):
+            self._cache[name] = value
+            return
+
+        super().__setattr__(name, value)
+        # Raw chapter, sections & policies are derived from the chapter contents
+        if name in ('title', 'number', 'markdown_contents'):
+            self._cache.clear()
 
-    @property
+    @stored_property
     def sections(self) -> list[Section]:
         """Lazy-load sections from chapter."""
-        if self._sections is None:
-            if self.section_extractor is None:
-                raise RuntimeError(f'section_extractor not set on Chapter {self.number}')
-            self._sections = self.section_extractor.extract_sections(self.raw)
-        return self._sections
+        if self.section_extractor is None:
+            raise RuntimeError(f'section_extractor not set on Chapter {self.number}')
+        return self.section_extractor.extract_sections(self.raw)
 
-    @property
+    @stored_property
     def policies(self) -> list[Policy]:
         """Create policies from sections."""
-        if self._policies is None:
-            # Launch policy builder workflows if they have not been processed
-            if not self.metadata.is_chapter_processed(self.number):
-                for section in self.sections:
-                    if not self.metadata.is_section_processed(section.id):
-                        self.policy_builder.process_section(section)
-                        self.metadata.mark_section_processed(section.id)
+        # Start loading the existing policies while the pending sections are processed
+        self.policy_builder.prefetch_policies()
+
+        # Launch policy builder workflows if they have not been processed
+        processed_now = not self.metadata.is_chapter_processed(self.number)
+        if processed_now:
+            with self.metadata.batch():
+                # Build the policies of the pending sections concurrently, as this mostly waits on the service
+                pending = [section for section in self.sections
+                           if not self.metadata.is_section_processed(section.id)]
+                errors = []
+                with ThreadPoolExecutor(max_workers=config.section_parallelism) as executor:
+                    futures = {executor.submit(self.policy_builder.process_section, section): section
+                               for section in pending}
+                    for future in as_completed(futures):
+                        if (error := future.exception()) is not None:
+                            errors.append(error)
+                        else:
+                            self.metadata.mark_section_processed(futures[future].id)
+
+                # Sections that completed are recorded, surface the first failure once all are done
+                if errors:
+                    raise errors[0]
 
                 # Mark chapter as processed in metadata, even if no policies have been created
                 self.metadata.mark_chapter_processed(self.number)
 
-            policies = self.policy_builder.get_policies_from_service(self.number)
-            self._policies = sorted(policies, key=lambda x: x.name)
+        # Skip querying the service for chapters processed by an earlier run that are known to have no policies
+        if not processed_now and not self.metadata.has_any_policies(self.number):
+            return []
 
-        return self._policies
+        # Only trust an empty answer right after processing the chapter, a stale one would hide its policies for good
+        policies = self.policy_builder.get_policies_from_service(self.number)
+        if processed_now or policies:
+            self.metadata.set_chapter_has_policies(self.number, bool(policies))
+        return policies
 
-    @property
+    @stored_property
     def raw(self) -> RawChapter:
         return RawChapter(title=self.title, number=self.number, markdown_contents=self.markdown_contents)
 
     @classmethod
     def from_raw(cls, raw_chapter: RawChapter, policy_builder: Any,
-                 section_extractor: Any = None, metadata: TechnicalSpecMetadata | None = None):
-        return cls(title=raw_chapter.title, number=raw_chapter.number, markdown_contents=raw_chapter.markdown_contents,
-                   policy_builder=policy_builder, section_extractor=section_extractor, metadata=metadata)
+                 section_extractor: Any = None, metadata: TechnicalSpecMetadata | None = None,
+                 sections: list[Section] | None = None):
+        chapter = cls(title=raw_chapter.title, number=raw_chapter.number,
+                      markdown_contents=raw_chapter.markdown_contents, policy_builder=policy_builder,
+                      section_extractor=section_extractor, metadata=metadata)
+        chapter.raw = raw_chapter
+        # Sections already extracted by the caller are used as is, instead of being extracted on first access
+        if sections is not None:
+            chapter.sections = sections
+        return chapter
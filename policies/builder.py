@@ -1,40 +1,103 @@
-import boto3
+import os
+import re
+import time
+import random
 import base64
 import hashlib
 import logging
+import threading
+import botocore.exceptions
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from models.arc import Policy
+from models.bedrock import get_bedrock_client, get_tagging_client
 from misc.config import config
+from pydantic_core import from_json, to_json
 from strands import Agent, tool
 from botocore.config import Config
 from strands.models import BedrockModel
-from strands_tools import file_read, sleep
+from strands_tools import file_read
 from models.technical_spec import TechnicalSpecMetadata, Section
 
-bedrock_client = boto3.client('bedrock', region_name=config.region)
 
+def _bedrock():
+    """Bedrock control plane client, created on first use rather than when importing this module."""
+    return get_bedrock_client(config.region)
 
-class PolicyBuilder:
-    def __init__(self, output_dir: Path, metadata: TechnicalSpecMetadata):
-        self._output_dir = output_dir
-        self._metadata = metadata
-        self._document_uuid = metadata.document_uuid
-        self._service_policies = None
-        tools = [self.create_policy, self.start_workflow, self.get_workflow, file_read, sleep]
-        model = BedrockModel(model_id=config.fm_id,
-                             boto_client_config=Config(read_timeout=180))
-        self.agent = Agent(model=model,
-                           system_prompt=r'''You are an agent tasked with converting technical specification documents to formal Bedrock 
+
+def _tagging():
+    """Resource Groups Tagging API client, created on first use rather than when importing this module."""
+    return get_tagging_client(config.region)
+
+
+# Policy names are limited to 63 characters, and prefixed with the chapter number they belong to
+_POLICY_NAME_MAX_LEN = 63
+
+
+def _policy_name_pattern(chapter_number: int) -> str:
+    """
+    Regular expression that the names of the policies of a chapter must verify, leaving room for the chapter prefix.
+
+    Parameters
+    ----------
+    chapter_number : The chapter number the policies belong to
+
+    Returns
+    -------
+    The regular expression
+    """
+    prefix = f'Ch{chapter_number:02d}_'
+    return f'^{prefix}[0-9a-zA-Z\\-_ ]{{1,{_POLICY_NAME_MAX_LEN - len(prefix)}}}$'
+
+# Concurrent requests when fetching the policies from the service, boto3 clients are thread-safe
+_SERVICE_WORKERS = 16
+
+# Seconds during which the policies fetched from the service are reused by later runs
+_SERVICE_CACHE_TTL = 3600
+
+# Policy build workflow statuses after which the workflow no longer changes, and bounds of the delay between checks
+_WORKFLOW_FINAL_STATUSES = {'COMPLETED', 'FAILED', 'CANCELLED'}
+_WORKFLOW_MIN_POLL_S = 2
+_WORKFLOW_MAX_POLL_S = 30
+
+SYSTEM_PROMPT = r'''You are an agent tasked with converting technical specification documents to formal Bedrock 
                 Automated Reasoning Policies and verifying that the resulting policies faithfully represent the criteria described 
                 in the original policy. In order to do that:
 
-                * Come up with a policy name that verifies the following regular expression
-                  ^[0-9a-zA-Z-_ ]{1,63}\$. and starts with "Ch{:02d}_", where the number denotes the chapter number.
+                * Come up with a policy name that verifies the regular expression provided with the section.
                 * Create a new empty Bedrock Automated Reasoning Policy with the name you came out in the previous step, 
                   note its ARN.
                 * Start a new Bedrock Automated Reasoning Policy Build Workflow for the policy created in the previous step.
-                * Wait for the Automated Reasoning Policy Build Workflow to complete, sleep a little bit if the workflow is 
-                  not complete.''', tools=tools)
+                * Wait for the Automated Reasoning Policy Build Workflow to complete with the wait_for_policy_build_workflow 
+                  tool, call it again if the workflow is still not complete.'''
+
+
+class PolicyBuilder:
+    def __init__(self, output_dir: Path, metadata: TechnicalSpecMetadata):
+        self._output_dir = output_dir
+        self._metadata = metadata
+        self._document_uuid = metadata.document_uuid
+        self._policies_by_chapter: dict[int, list[Policy]] | None = None
+        self._latest_workflows: dict[str, str] = {}
+        self._created_policy_tags: dict[str, dict[str, str]] = {}
+        self._tools = [self.create_policy, self.start_workflow, self.get_workflow, self.wait_for_workflow, file_read]
+        self._local = threading.local()
+
+        # Loaded policies are replaced under the lock, the generation changes whenever they are invalidated
+        self._policies_lock = threading.Lock()
+        self._policies_generation = 0
+        self._prefetch_thread: threading.Thread | None = None
+
+    @property
+    def agent(self) -> Agent:
+        """Lazy-load the policy building agent of the calling thread, as agents can not be invoked concurrently."""
+        agent = getattr(self._local, 'agent', None)
+        if agent is None:
+            model = BedrockModel(model_id=config.fm_id,
+                                 boto_client_config=Config(read_timeout=180))
+            agent = self._local.agent = Agent(model=model, system_prompt=SYSTEM_PROMPT, tools=self._tools)
+
+        return agent
 
     def process_section(self, section: Section) -> None:
         """
@@ -44,10 +107,11 @@ class PolicyBuilder:
         ----------
         section : Section to process
         """
-        print(f'Creating policy for section {section.id}')
+        logging.info(f'Creating policy for section {section.id}')
 
         # Execute processing
-        self.agent(f'Create a formal policy for the following section in chapter {section.chapter_number}:\n\n'
+        self.agent(f'Create a formal policy for the following section in chapter {section.chapter_number}, its name '
+                   f'must verify the regular expression {_policy_name_pattern(section.chapter_number)}:\n\n'
                    f'<section_title>{section.title}</section_title>\n'
                    f'<section_content>{section.markdown_contents}</section_content>\n'
                    f'<section_id>{section.id}</section_id>')
@@ -72,18 +136,29 @@ class PolicyBuilder:
         -------
         The details about the created policy
         """
+        # Fail fast on names the service would reject, or that do not identify the chapter
+        name_pattern = _policy_name_pattern(chapter_number)
+        if not re.fullmatch(name_pattern, policy_name):
+            return {'toolUseId': f'create_policy-{policy_name}',
+                    'status': 'error',
+                    'content': [{'text': f'Invalid policy name {policy_name}, it must verify the regular expression '
+                                         f'{name_pattern}'}]}
+
         try:
             # Add tags if document_uuid is available
             tags = [{'key': 'document_uuid', 'value': self._document_uuid},
                     {'key': 'chapter_number', 'value': f'{chapter_number}'},
                     {'key': 'section_id', 'value': section_id}]
 
-            response = bedrock_client.create_automated_reasoning_policy(name=policy_name,
-                                                                        description=policy_description,
-                                                                        tags=tags)
+            response = _bedrock().create_automated_reasoning_policy(name=policy_name,
+                                                                    description=policy_description,
+                                                                    tags=tags)
             del response['ResponseMetadata']
             response['createdAt'] = response['createdAt'].isoformat()
             response['updatedAt'] = response['updatedAt'].isoformat()
+            self._created_policy_tags[response['policyArn']] = {tag['key']: tag['value'] for tag in tags}
+            self._metadata.clear_chapter_has_policies(chapter_number)
+            self._invalidate_service_policies()
 
             retval = {'toolUseId': f'create_policy-{policy_name}',
                       'status': 'success',
@@ -113,7 +188,8 @@ class PolicyBuilder:
         -------
         The Bedrock Automated Reasoning Policy Build Workflow ID
         """
-        source_content = {'workflowContent': {'documents': [{'document': base64.b64encode(document.encode()),
+        document_bytes = document.encode()
+        source_content = {'workflowContent': {'documents': [{'document': base64.b64encode(document_bytes),
                                                              'documentContentType': 'txt',
                                                              'documentName': document_name}]}}
         source_content['workflowContent']['documents'][0]['documentDescription'] = (
@@ -121,11 +197,12 @@ class PolicyBuilder:
             "relevant aspects of the full Technical Specification.\n"
             "The special variable must be named exactly \"IsCompliantWithFullPolicy\".\n"
             "Every single rule, without exception, must be conditioned on \"IsCompliantWithFullPolicy\".\n")
-        crt = hashlib.sha256(document.encode()).hexdigest()
+        crt = hashlib.sha256(document_bytes).hexdigest()
         try:
-            response = bedrock_client.start_automated_reasoning_policy_build_workflow(policyArn=policy_arn,
-                                                                                      buildWorkflowType='INGEST_CONTENT',
-                                                                                      sourceContent=source_content)
+            response = _bedrock().start_automated_reasoning_policy_build_workflow(policyArn=policy_arn,
+                                                                                  buildWorkflowType='INGEST_CONTENT',
+                                                                                  sourceContent=source_content)
+            self._latest_workflows[policy_arn] = response['buildWorkflowId']
 
             retval = {'toolUseId': f'start_policy_build_workflow-{crt}',
                       'status': 'success',
@@ -154,11 +231,7 @@ class PolicyBuilder:
         The detailed information about the policy build workflow
         """
         try:
-            response = bedrock_client.get_automated_reasoning_policy_build_workflow(policyArn=policy_arn,
-                                                                                    buildWorkflowId=build_workflow_id)
-            del response['ResponseMetadata']
-            response['createdAt'] = response['createdAt'].isoformat()
-            response['updatedAt'] = response['updatedAt'].isoformat()
+            response = self._describe_workflow(policy_arn, build_workflow_id)
 
             retval = {'toolUseId': f'get_policy_build_workflow-{build_workflow_id}',
                       'status': 'success',
@@ -171,83 +244,382 @@ class PolicyBuilder:
                       'content': [{'text': f'{e}'}]}
         return retval
 
+    @tool(name='wait_for_policy_build_workflow')
+    def wait_for_workflow(self, policy_arn: str, build_workflow_id: str, max_wait_s: int = 600) -> dict:
+        """
+        Waits for an Automated Reasoning policy build workflow to finish, checking its status with an increasing
+        delay between checks.
+
+        Parameters
+        ----------
+        policy_arn : The ARN for the policy
+        build_workflow_id : The unique identifier of the build workflow to wait for.
+        max_wait_s : Maximum number of seconds to wait for the workflow to finish.
+
+        Returns
+        -------
+        The detailed information about the policy build workflow, once finished or after waiting for the
+        maximum time
+        """
+        deadline = time.monotonic() + max_wait_s
+        delay = _WORKFLOW_MIN_POLL_S
+        try:
+            while True:
+                response = self._describe_workflow(policy_arn, build_workflow_id)
+                remaining = deadline - time.monotonic()
+                if response['status'] in _WORKFLOW_FINAL_STATUSES or remaining <= 0:
+                    break
+
+                # Exponential backoff with jitter, so that concurrent waits do not poll in lockstep
+                time.sleep(min(delay + random.uniform(0, delay / 2), _WORKFLOW_MAX_POLL_S, remaining))
+                delay = min(delay * 2, _WORKFLOW_MAX_POLL_S)
+
+            retval = {'toolUseId': f'wait_for_policy_build_workflow-{build_workflow_id}',
+                      'status': 'success',
+                      'content': [{'text': f'Workflow with buildWorkflowId {response["buildWorkflowId"]} '
+                                           f'is in status {response["status"]} since {response["updatedAt"]}.'},
+                                  {'json': response}]}
+        except Exception as e:
+            retval = {'toolUseId': f'wait_for_policy_build_workflow-{build_workflow_id}',
+                      'status': 'error',
+                      'content': [{'text': f'{e}'}]}
+        return retval
+
+    @staticmethod
+    def _describe_workflow(policy_arn: str, build_workflow_id: str) -> dict:
+        """
+        Retrieve a policy build workflow, in a form that can be serialized for the agent.
+
+        Parameters
+        ----------
+        policy_arn : The ARN for the policy
+        build_workflow_id : The unique identifier of the build workflow to retrieve
+
+        Returns
+        -------
+        The policy build workflow details
+        """
+        response = _bedrock().get_automated_reasoning_policy_build_workflow(policyArn=policy_arn,
+                                                                            buildWorkflowId=build_workflow_id)
+        del response['ResponseMetadata']
+        response['createdAt'] = response['createdAt'].isoformat()
+        response['updatedAt'] = response['updatedAt'].isoformat()
+        return response
+
     def get_policies_from_service(self, chapter_number: int, force_refresh: bool = False) -> list[Policy]:
         """
         Query Bedrock AR service for existing policies matching document UUID and chapter number.
-        Returns the latest version of each policy.
+        Returns the latest version of each policy, sorted by name.
         """
         if not self._document_uuid:
             return []
 
-        # List all policies with pagination
-        if self._service_policies is None or force_refresh:
-            logging.debug('Fetching all policies from the Bedrock ARc service...')
-            self._service_policies = {'tags': {},
-                                      'policies': {}}
-            all_policies = {}
-            # Fetch the policy summaries
-            next_token = None
-            while True:
-                kwargs = {'maxResults': 100}
-                if next_token:
-                    kwargs['nextToken'] = next_token
+        # Let a prefetch in progress finish rather than fetching the same policies again
+        if self._prefetch_thread is not None:
+            self._prefetch_thread.join()
+
+        # A refresh may find policies in chapters that had none
+        if force_refresh:
+            self._metadata.clear_chapter_has_policies()
+
+        with self._policies_lock:
+            if self._policies_by_chapter is None or force_refresh:
+                self._policies_by_chapter, fetched_responses = self._load_service_policies(force_refresh)
+                if fetched_responses is not None:
+                    self._save_service_cache(fetched_responses)
 
-                response = bedrock_client.list_automated_reasoning_policies(**kwargs)
-                for summary in response['automatedReasoningPolicySummaries']:
-                    all_policies[summary['policyArn']] = summary
+            return list(self._policies_by_chapter.get(chapter_number, []))
 
-                next_token = response.get('nextToken')
-                if not next_token:
+    def prefetch_policies(self) -> None:
+        """
+        Start loading the document policies in the background, so that they are usually ready by the time they are
+        first queried. Only the first call has an effect.
+        """
+        if self._document_uuid and self._prefetch_thread is None:
+            self._prefetch_thread = threading.Thread(target=self._prefetch_service_policies,
+                                                     name='policies-prefetch', daemon=True)
+            self._prefetch_thread.start()
+
+    def _prefetch_service_policies(self) -> None:
+        """
+        Load the document policies ahead of the first query, unless a query already did. The policies are loaded
+        without holding the lock, and discarded if they were invalidated in the meantime.
+        """
+        try:
+            with self._policies_lock:
+                if self._policies_by_chapter is not None:
+                    return
+                generation = self._policies_generation
+
+            policies_by_chapter, fetched_responses = self._load_service_policies()
+
+            with self._policies_lock:
+                if self._policies_by_chapter is None and self._policies_generation == generation:
+                    self._policies_by_chapter = policies_by_chapter
+                    if fetched_responses is not None:
+                        self._save_service_cache(fetched_responses)
+        except Exception as e:
+            logging.warning(f'Failed to prefetch policies from the service: {e}')
+
+    def _load_service_policies(self, force_refresh: bool = False) -> tuple[dict[int, list[Policy]], dict | None]:
+        """
+        Load the document policies, from a recent cache or from the service, and bucket them by chapter.
+
+        Parameters
+        ----------
+        force_refresh : Whether to ignore the cached policies and fetch them from the service
+
+        Returns
+        -------
+        The policies by chapter number, and the service responses to cache if they were fetched from the service
+        by listing all the policies
+        """
+        # Reuse the policies fetched by a recent run, unless asked to refresh them
+        responses = None if force_refresh else self._load_service_cache()
+        fetched_responses = None
+        if responses is None:
+            responses, complete = self._fetch_service_policies()
+            # Policies found through the eventually consistent tagging API may be incomplete, only reuse them in
+            # this process rather than caching them for later runs
+            if complete:
+                fetched_responses = responses
+
+        # Bucket the policies by chapter once, sorted by name
+        policies_by_chapter = {}
+        for arn, (metadata, definition) in responses['policies'].items():
+            policy_chapter = responses['tags'][arn]['chapter_number']
+            policy = Policy.from_service_response(metadata, definition, chapter_number=policy_chapter)
+            policies_by_chapter.setdefault(policy_chapter, []).append(policy)
+        for chapter_policies in policies_by_chapter.values():
+            chapter_policies.sort(key=lambda p: p.name)
+
+        return policies_by_chapter, fetched_responses
+
+    def _fetch_service_policies(self) -> tuple[dict, bool]:
+        """
+        Fetch the tags and latest definitions of the policies of this document from the Bedrock ARc service.
+
+        Returns
+        -------
+        Dictionary with the tags (ARN -> tags) and the policy responses (ARN -> (metadata, definition)), and
+        whether the policies were found by listing all the policies rather than through the tagging API
+        """
+        logging.debug('Fetching the document policies from the Bedrock ARc service...')
+        document_tags, complete = self._get_document_policy_tags()
+        responses = {'tags': document_tags,
+                     'policies': {}}
+
+        # Tag values are strings, parse the chapter number once so that policies are bucketed by integer. Policies
+        # without a valid chapter number can not be attributed to a chapter, skip them
+        for policy_arn, tags in list(responses['tags'].items()):
+            try:
+                tags['chapter_number'] = int(tags['chapter_number'])
+            except (KeyError, ValueError):
+                logging.warning(f'Skipping policy {policy_arn}, its chapter_number tag is missing or invalid')
+                del responses['tags'][policy_arn]
+
+        # Retrieve the definitions for the latest versions of the policies of this document. This needs several
+        # requests per policy, so issue them concurrently
+        with ThreadPoolExecutor(max_workers=_SERVICE_WORKERS) as executor:
+            document_arns = list(responses['tags'])
+            for policy_arn, response in zip(document_arns, executor.map(self._get_latest_policy, document_arns)):
+                if response is not None:
+                    responses['policies'][policy_arn] = response
+
+        return responses, complete
+
+    def _get_document_policy_tags(self) -> tuple[dict[str, dict[str, str]], bool]:
+        """
+        Find the policies of this document and their tags with a single paginated query to the tagging API,
+        falling back to listing all the policies and fetching their tags one by one if the query fails or finds
+        nothing, as the tagging API may not have indexed the policies yet.
+
+        Returns
+        -------
+        Policy tags as a key -> value dictionary, per policy ARN, and whether they come from listing all the policies
+        """
+        try:
+            document_tags = {}
+            pagination_token = ''
+            while True:
+                response = _tagging().get_resources(
+                    TagFilters=[{'Key': 'document_uuid', 'Values': [self._document_uuid]}],
+                    ResourceTypeFilters=['bedrock:automated-reasoning-policy'],
+                    PaginationToken=pagination_token)
+                for mapping in response['ResourceTagMappingList']:
+                    document_tags[mapping['ResourceARN']] = {tag['Key']: tag['Value'] for tag in mapping['Tags']}
+
+                pagination_token = response.get('PaginationToken')
+                if not pagination_token:
                     break
+        except Exception as e:
+            logging.warning(f'Failed to query the policies by tag, listing all policies instead: {e}')
+            document_tags = None
+
+        if not document_tags:
+            return self._list_document_policy_tags(), True
 
-            # Fetch the tags per policy and store the policies that apply to this document
-            for policy_arn in all_policies:
-                tags_response = bedrock_client.list_tags_for_resource(resourceARN=policy_arn)
-                tags = {tag['key']: tag['value'] for tag in tags_response.get('tags', [])}
+        # The tagging API is eventually consistent, so it may miss the policies just created by this process
+        return self._created_policy_tags | document_tags, False
+
+    def _list_document_policy_tags(self) -> dict[str, dict[str, str]]:
+        """
+        List all the policies in the service and keep those of this document, by fetching the tags of each one.
+
+        Returns
+        -------
+        Policy tags as a key -> value dictionary, per policy ARN
+        """
+        all_policies = {}
+        next_token = None
+        while True:
+            kwargs = {'maxResults': 100}
+            if next_token:
+                kwargs['nextToken'] = next_token
+
+            response = _bedrock().list_automated_reasoning_policies(**kwargs)
+            for summary in response['automatedReasoningPolicySummaries']:
+                all_policies[summary['policyArn']] = summary
+
+            next_token = response.get('nextToken')
+            if not next_token:
+                break
+
+        # Fetching the tags needs a request per policy, so issue them concurrently
+        policy_arns = list(all_policies)
+        document_tags = {}
+        with ThreadPoolExecutor(max_workers=_SERVICE_WORKERS) as executor:
+            for policy_arn, tags in zip(policy_arns, executor.map(self._get_policy_tags, policy_arns)):
                 if tags.get('document_uuid') == self._document_uuid:
-                    self._service_policies['tags'][policy_arn] = tags
+                    document_tags[policy_arn] = tags
 
-            # Finally, retrieve the definitions for the latest versions of the policies
-            for policy_arn in self._service_policies['tags']:
-                versions = []
-                next_token = None
+        return document_tags
 
-                while True:
-                    kwargs = {'policyArn': f'{policy_arn}', 'maxResults': 100}
-                    if next_token:
-                        kwargs['nextToken'] = next_token
+    @property
+    def _service_cache_path(self) -> Path:
+        return self._output_dir / f'.ar_cache_v2_{self._document_uuid}.json'
 
-                    versions_response = bedrock_client.list_automated_reasoning_policies(**kwargs)
-                    versions.extend(versions_response.get('automatedReasoningPolicySummaries', []))
+    def _load_service_cache(self) -> dict | None:
+        """Load the policy responses cached by a previous run, if they are recent enough."""
+        cache_path = self._service_cache_path
+        try:
+            if time.time() - cache_path.stat().st_mtime > _SERVICE_CACHE_TTL:
+                return None
+            responses = from_json(cache_path.read_bytes())
+            logging.debug(f'Loaded service policies from cache: {cache_path}')
+            return responses
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f'Failed to load service policies cache: {e}')
+            return None
 
-                    next_token = versions_response.get('nextToken')
-                    if not next_token:
-                        break
+    def _save_service_cache(self, responses: dict) -> None:
+        """Atomically save the policy responses, so that an interrupted write never leaves a corrupt cache."""
+        cache_path = self._service_cache_path
+        tmp_path = cache_path.with_suffix('.tmp')
+        try:
+            tmp_path.write_bytes(to_json(responses))
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logging.warning(f'Failed to save service policies cache: {e}')
 
-                if versions:
-                    # Sort by version and get latest
-                    latest_version = max(versions, key=lambda v: -1 if v['version'] == 'DRAFT' else int(v['version']))
-                    version_id = latest_version['version']
+    def _invalidate_service_policies(self) -> None:
+        """Forget the policies fetched from the service, so that they are fetched again on the next query."""
+        with self._policies_lock:
+            self._policies_by_chapter = None
+            self._policies_generation += 1
+            self._service_cache_path.unlink(missing_ok=True)
 
-                    # Get full policy definition, needed as we want to have the policy definition hash
-                    versioned_policy_arn = policy_arn if version_id == 'DRAFT' else f'{policy_arn}:{version_id}'
-                    policy_data = bedrock_client.get_automated_reasoning_policy(
-                        policyArn=versioned_policy_arn
-                    )
+    @staticmethod
+    def _get_policy_tags(policy_arn: str) -> dict[str, str]:
+        """
+        Retrieve the tags of a policy.
 
-                    # Retrieve policy definition
-                    print(f'Retrieving definition for policy {policy_arn}')
-                    policy_definition = self._export_policy_definition(policy_arn, latest_version)
+        Parameters
+        ----------
+        policy_arn : The policy ARN
+
+        Returns
+        -------
+        Policy tags as a key -> value dictionary
+        """
+        tags_response = _bedrock().list_tags_for_resource(resourceARN=policy_arn)
+        return {tag['key']: tag['value'] for tag in tags_response.get('tags', [])}
 
-                    policy = Policy.from_service_response(policy_data, policy_definition)
-                    self._service_policies['policies'][policy_arn] = policy
+    def _get_latest_policy(self, policy_arn: str) -> tuple[dict, dict] | None:
+        """
+        Retrieve the latest version of a policy, including its definition, skipping policies that no longer exist.
+        The tagging API keeps listing deleted policies for a while.
 
-        return sorted([policy for arn, policy in self._service_policies['policies'].items()
-                       if self._service_policies['tags'][arn]['chapter_number'] == f'{chapter_number}'],
-                      key=lambda p: p.name)
+        Parameters
+        ----------
+        policy_arn : The policy ARN
 
-    @staticmethod
-    def _export_policy_definition(policy_arn: str, latest_version: dict) -> str:
+        Returns
+        -------
+        The metadata & definition of the latest version of the policy, or None if it has no versions or was deleted
+        """
+        try:
+            return self._get_latest_policy_version(policy_arn)
+        except botocore.exceptions.ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'ResourceNotFoundException':
+                raise
+            logging.warning(f'Skipping policy {policy_arn}, it no longer exists')
+            return None
+
+    def _get_latest_policy_version(self, policy_arn: str) -> tuple[dict, dict] | None:
+        """
+        Retrieve the latest version of a policy, including its definition.
+
+        Parameters
+        ----------
+        policy_arn : The policy ARN
+
+        Returns
+        -------
+        The metadata & definition of the latest version of the policy, or None if it has no versions
+        """
+        # Keep track of the latest version while paginating, parsing each version number once. DRAFT comes before
+        # any numbered version
+        latest_version = None
+        latest_number = -2
+        next_token = None
+
+        while True:
+            kwargs = {'policyArn': f'{policy_arn}', 'maxResults': 100}
+            if next_token:
+                kwargs['nextToken'] = next_token
+
+            versions_response = _bedrock().list_automated_reasoning_policies(**kwargs)
+            for version in versions_response.get('automatedReasoningPolicySummaries', []):
+                number = -1 if version['version'] == 'DRAFT' else int(version['version'])
+                if number > latest_number:
+                    latest_version, latest_number = version, number
+
+            next_token = versions_response.get('nextToken')
+            if not next_token:
+                break
+
+        if latest_version is None:
+            return None
+
+        version_id = latest_version['version']
+
+        # Get full policy definition, needed as we want to have the policy definition hash
+        versioned_policy_arn = policy_arn if version_id == 'DRAFT' else f'{policy_arn}:{version_id}'
+        policy_data = _bedrock().get_automated_reasoning_policy(
+            policyArn=versioned_policy_arn
+        )
+        del policy_data['ResponseMetadata']
+
+        # Retrieve policy definition
+        logging.debug(f'Retrieving definition for policy {policy_arn}')
+        policy_definition = self._export_policy_definition(policy_arn, latest_version)
+
+        return policy_data, policy_definition
+
+    def _export_policy_definition(self, policy_arn: str, latest_version: dict) -> str:
         """
         Export policy definition, working around AWS bug where DRAFT-only policies return empty.
 
@@ -265,30 +637,32 @@ class PolicyBuilder:
             # Workaround: Get definition from build workflow artifacts
             logging.debug(f'Only DRAFT version available for {policy_arn}, using build artifacts workaround')
 
-            # List build workflows for this policy
-            workflows = []
-            next_token = None
-            while True:
-                kwargs = {'policyArn': policy_arn, 'maxResults': 100}
-                if next_token:
-                    kwargs['nextToken'] = next_token
+            # Reuse the build workflow started or found earlier for this policy, or list them to find the latest
+            build_workflow_id = self._latest_workflows.get(policy_arn)
+            if build_workflow_id is None:
+                workflows = []
+                next_token = None
+                while True:
+                    kwargs = {'policyArn': policy_arn, 'maxResults': 100}
+                    if next_token:
+                        kwargs['nextToken'] = next_token
 
-                response = bedrock_client.list_automated_reasoning_policy_build_workflows(**kwargs)
-                workflows.extend(response.get('automatedReasoningPolicyBuildWorkflowSummaries', []))
+                    response = _bedrock().list_automated_reasoning_policy_build_workflows(**kwargs)
+                    workflows.extend(response.get('automatedReasoningPolicyBuildWorkflowSummaries', []))
 
-                next_token = response.get('nextToken')
-                if not next_token:
-                    break
+                    next_token = response.get('nextToken')
+                    if not next_token:
+                        break
 
-            if not workflows:
-                raise RuntimeError(f'No build workflows found for policy {policy_arn}')
+                if not workflows:
+                    raise RuntimeError(f'No build workflows found for policy {policy_arn}')
 
-            # Get latest workflow (most recent createdAt)
-            latest_workflow = max(workflows, key=lambda w: w['createdAt'])
-            build_workflow_id = latest_workflow['buildWorkflowId']
+                # Get latest workflow (most recent createdAt)
+                latest_workflow = max(workflows, key=lambda w: w['createdAt'])
+                build_workflow_id = self._latest_workflows[policy_arn] = latest_workflow['buildWorkflowId']
 
             # Retrieve policy definition from build artifacts
-            result = bedrock_client.get_automated_reasoning_policy_build_workflow_result_assets(
+            result = _bedrock().get_automated_reasoning_policy_build_workflow_result_assets(
                 policyArn=policy_arn,
                 buildWorkflowId=build_workflow_id,
                 assetType='POLICY_DEFINITION'
@@ -299,7 +673,7 @@ class PolicyBuilder:
             # Use standard export API for published versions
             versioned_policy_arn = f'{policy_arn}:{latest_version['version']}'
 
-            policy_definition = bedrock_client.export_automated_reasoning_policy_version(
+            policy_definition = _bedrock().export_automated_reasoning_policy_version(
                 policyArn=versioned_policy_arn
             )
             return policy_definition['policyDefinition']
@@ -1,14 +1,19 @@
 """Document processing service with proper error handling and validation."""
 
+import os
 import json
-import boto3
 import hashlib
 import logging
 from pathlib import Path
 from strands import Agent
 from datetime import datetime
+from itertools import repeat
+from weakref import WeakValueDictionary
+from concurrent.futures import ThreadPoolExecutor
 from misc.config import config
-from models.arc import ResolvedPolicy
+from pydantic_core import from_json, to_json
+from models.arc import Policy, ResolvedPolicy
+from models.bedrock import get_bedrock_runtime_client
 from strands.models import BedrockModel
 from policies.builder import PolicyBuilder
 from botocore.config import Config as BotocoreConfig
@@ -20,6 +25,74 @@ from models.technical_spec import DocumentMetadata, TechnicalSpecMetadata, Intro
 
 logger = logging.getLogger(__name__)
 
+# Policies evaluated concurrently when checking the compliance of a proposal
+_COMPLIANCE_WORKERS = 16
+
+# Technical specifications in use, keyed by file path, modification time, size and output directory
+_spec_cache: WeakValueDictionary[tuple[str, int, int, Path], 'TechnicalSpec'] = WeakValueDictionary()
+
+# Digests of the proposal files already hashed by this process, keyed by path, modification time and size
+_file_digest_cache: dict[tuple[str, int, int], str] = {}
+
+
+def _file_digest(file_path: Path) -> str:
+    """
+    Hash a file, reusing the digest computed earlier by this process as long as the file is unchanged.
+
+    Parameters
+    ----------
+    file_path : Path of the file to hash
+
+    Returns
+    -------
+    Hex digest of the file contents
+    """
+    stat = file_path.stat()
+    key = (str(file_path.absolute()), stat.st_mtime_ns, stat.st_size)
+    if (digest := _file_digest_cache.get(key)) is None:
+        digest = _file_digest_cache[key] = TechnicalSpecMetadata.compute_file_hash(file_path)
+
+    return digest
+
+
+def _atomic_write_bytes(path: Path, data: bytes, fsync: bool = False) -> None:
+    """
+    Write a file through a temporary sibling renamed over it, so that an interrupted write never leaves it torn.
+
+    Parameters
+    ----------
+    path : Path of the file to write
+    data : Contents of the file
+    fsync : Whether to make sure the contents are on disk before the rename, so that they also survive a crash
+    """
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _read_text_if_exists(path: Path | None) -> str | None:
+    """
+    Read a text file, if there is one.
+
+    Parameters
+    ----------
+    path : Path of the file to read, if any
+
+    Returns
+    -------
+    Contents of the file, or None if there is no path or the file does not exist
+    """
+    if path is None:
+        return None
+    try:
+        return path.read_text(encoding='utf-8')
+    except FileNotFoundError:
+        return None
+
 
 class TechnicalSpec:
     """PDF-based Technical Spec document handling."""
@@ -30,7 +103,8 @@ class TechnicalSpec:
             raise RuntimeError(f"Cannot read input PDF file: {file_path}")
 
         # Check file size
-        file_size_mb = file_path.stat().st_size / (1024 * 1024)
+        file_stat = file_path.stat()
+        file_size_mb = file_stat.st_size / (1024 * 1024)
         if file_size_mb > config.max_document_size_mb:
             raise RuntimeError(f"File too large: {file_size_mb:.1f}MB "
                                f"(max: {config.max_document_size_mb}MB)")
@@ -47,14 +121,20 @@ class TechnicalSpec:
         self._publication_date = None
         self._consolidated_text: str | None = None
         self._metadata: TechnicalSpecMetadata | None = None
+        # Contents of the file when they had to be read for hashing, kept until they are sent to the agent
+        self._file_bytes: bytes | None = None
 
         # Calculate file hash for caching
-        self.file_hash = hashlib.sha512(self.file_path.read_bytes()).hexdigest()
+        self.file_hash = self._compute_file_hash(file_stat)
         self._metadata_path = config.output_dir / f'{file_path.stem}.metadata.json'
 
         # Agent-related stuff
         self._agent = None
         self._compliance_agents = {}
+        # Digests of the files of the output folder known to be up to date, to avoid rewriting them
+        self._written_digests: dict[Path, bytes] = {}
+        # Compliance cache keys already computed, per proposal hash, policy ID and policy definition hash
+        self._hash_key_cache: dict[tuple[str, str, str], str] = {}
         self.policy_builder = PolicyBuilder(output_dir=config.output_dir,
                                             metadata=self.metadata)
         self.section_extractor = SectionExtractor(cache_path=self._metadata_path)
@@ -62,14 +142,18 @@ class TechnicalSpec:
         # Load from cache if available
         self._load_from_cache()
 
+        # The transcription agent is not needed when the whole document is cached, do not hold on to its contents
+        if self._introduction is not None and self._chapters is not None \
+                and len(self._chapters) >= self._num_chapters:
+            self._file_bytes = None
+
     @property
     def metadata(self) -> TechnicalSpecMetadata:
         """Lazy-load or create metadata for this technical specification."""
         if self._metadata is None:
             if self._metadata_path.exists():
                 try:
-                    data = json.loads(self._metadata_path.read_text())
-                    self._metadata = TechnicalSpecMetadata(**data)
+                    self._metadata = TechnicalSpecMetadata.model_validate_json(self._metadata_path.read_bytes())
                     # Update hash if file changed
                     if self._metadata.file_hash != self.file_hash:
                         logger.warning(f"File hash mismatch, updating metadata")
@@ -98,9 +182,44 @@ class TechnicalSpec:
 
         return self._metadata
 
+    def _compute_file_hash(self, file_stat: os.stat_result) -> str:
+        """
+        Compute the hash of the technical specification file, reusing the one recorded in a sidecar file of the cache
+        directory as long as the size and modification time of the file do not change.
+
+        Parameters
+        ----------
+        file_stat : Status of the technical specification file
+
+        Returns
+        -------
+        Hex digest of the file contents
+        """
+        file_meta = {'path': str(self.file_path.absolute()), 'mtime_ns': file_stat.st_mtime_ns,
+                     'size': file_stat.st_size}
+        meta_path = config.cache_dir / f'{self.file_path.name}.hashmeta.json'
+        try:
+            hash_meta = from_json(meta_path.read_bytes())
+            if hash_meta.get('file') == file_meta:
+                return hash_meta['file_hash']
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f'Failed to load file hash cache: {e}')
+
+        # The file is small enough to be kept in memory, read it once for both hashing and the agent
+        self._file_bytes = self.file_path.read_bytes()
+        file_hash = hashlib.sha512(self._file_bytes).hexdigest()
+        try:
+            _atomic_write_bytes(meta_path, to_json({'file': file_meta, 'file_hash': file_hash}))
+        except Exception as e:
+            logger.warning(f'Failed to save file hash cache: {e}')
+
+        return file_hash
+
     def _save_metadata(self) -> None:
-        """Save metadata to disk."""
-        self._metadata_path.write_text(self._metadata.model_dump_json(indent=2))
+        """Save metadata to disk, replacing the previous file atomically so that it is never left half-written."""
+        _atomic_write_bytes(self._metadata_path, to_json(self._metadata, indent=2), fsync=True)
 
     @property
     def agent(self) -> Agent:
@@ -147,13 +266,15 @@ class TechnicalSpec:
             # Send the document contents to the agent for later use
             self._agent([ContentBlock(document={'format': 'pdf',
                                                 'name': self.file_path.stem,
-                                                'source': {'bytes': self.file_path.read_bytes()}}),
+                                                'source': {'bytes': self._file_bytes or
+                                                                    self.file_path.read_bytes()}}),
                          ContentBlock(
                              text=f'This document is named "{self.file_path.stem}" and contains the technical '
                                   'specification I need you to work on. Whenever I talk about the technical '
                                   f'specification or "{self.file_path.stem}", I\'m referring to this PDF document. '
                                   'Confirm with a single word that you have understood this.'),
                          ContentBlock(cachePoint=CachePoint(type='default'))])
+            self._file_bytes = None
             logger.info("Transcription agent initialized successfully")
             # self._agent.conversation_manager.checkpoint(self._agent)
 
@@ -210,8 +331,12 @@ class TechnicalSpec:
 
     @property
     def consolidated_text(self) -> str:
+        # Build the text from the chapters already in memory on first access, which are only processed if missing
         if self._consolidated_text is None:
-            self._process_document()
+            parts = [self.introduction.markdown_contents, '\n\n']
+            for chapter in self.chapters:
+                parts += [chapter.markdown_contents, '\n\n']
+            self._consolidated_text = ''.join(parts)
 
         return self._consolidated_text
 
@@ -228,7 +353,7 @@ class TechnicalSpec:
         policy_map = {p.id: p for p in resolved_policies}
         chapters_data = []
         for chapter in self.chapters:
-            chapter_policies = [policy_map[p.id] for p in chapter.policies if p.id in policy_map]
+            chapter_policies = [rp for p in chapter.policies if (rp := policy_map.get(p.id)) is not None]
             if chapter_policies:
                 chapters_data.append((f"Chapter {chapter.number}: {chapter.title}", chapter_policies))
 
@@ -253,77 +378,102 @@ class TechnicalSpec:
             if not p.is_file():
                 raise RuntimeError(f'Cannot read proposal file: {p}')
 
-        # Calculate cache key from proposal contents
-        proposal_hash = hashlib.sha512(b''.join(p.read_bytes() for p in proposal_paths)).hexdigest()
+        # Start loading the policies while the proposal is hashed and the chapters are loaded
+        self.policy_builder.prefetch_policies()
 
-        resolved_policies = []
-        for chapter in self.chapters:
-            print(f'Processing policy chapter {chapter.number} - {chapter.title}')
-            for policy in chapter.policies:
-                if len(policy.variables) == 0:
-                    print(f'\tSkipping empty policy {policy.name}')
-                    continue
-                print(f'\tProcessing policy {policy.name}')
-                # Calculate cache key for this specific policy + proposal combination
-                hash_key = hashlib.sha512(f'{proposal_hash}_{policy.id}_{policy.definition_hash}'.encode()).hexdigest()
-                cache_path = config.cache_dir / f'resolved_policy_{hash_key}.json'
-
-                # Try loading from cache
-                if cache_path.exists():
-                    try:
-                        cache_data = json.loads(cache_path.read_text())
-                        resolved_policy = ResolvedPolicy(**cache_data)
-                        logging.debug(f'Loaded compliance result from cache: {cache_path}')
-                        resolved_policies.append(resolved_policy)
-                        continue
-                    except Exception as e:
-                        logging.debug(f'Failed to load compliance cache: {e}, regenerating')
-
-                # Resolve the variables in the policy for the given proposal
-                resolved_policy = policy.resolve_vars(proposal_paths)
-                resolved_vars = [v for v in resolved_policy.variables
-                                 if v.value is not None and v.name != 'IsCompliantWithFullPolicy']
-                if not resolved_vars:
-                    resolved_policy.ar_assessment = [{'notApplicable': {}}]
-                else:
-                    # Try to avoid TOO_COMPLEX policy errors by reducing the amount
-                    # of characters sent to the model
-                    warned = False
-                    while True:
-                        assigned_vars = {'premises': {v.name: v.value for v in resolved_vars},
-                                         'claims': {'IsCompliantWithFullPolicy': 'true'}}
-                        serialized = json.dumps(assigned_vars, separators=(',', ':')).replace('"', '')
-                        if len(serialized) > 400:
-                            if not warned:
-                                warned = True
-                                logging.warning('Evaluating the policy with a reduced set of variables to '
-                                                'try to get results from the system')
-                            resolved_vars = resolved_vars[:-1]
-                            continue
-                        break
-                    # Ask ARc about the assigned vars, obtain their findings
-                    bedrock_client = boto3.client(service_name='bedrock-runtime', region_name=config.region)
-                    content = [{'text': {'text': serialized,
-                                         "qualifiers": ["guard_content"]}}]
-                    logging.debug(f'Evaluating {policy.name} guardrail against the set of assigned variables\n' +
-                                  json.dumps(assigned_vars, indent=2))
-                    response = bedrock_client.apply_guardrail(guardrailIdentifier=policy.guardrail.id,
-                                                              guardrailVersion=policy.guardrail.version,
-                                                              content=content,
-                                                              outputScope='FULL',
-                                                              source='OUTPUT')
-                    findings = response['assessments'][0]['automatedReasoningPolicy']['findings']
-                    resolved_policy.ar_assessment = findings
-                resolved_policies.append(resolved_policy)
-
-                # Save to cache
-                try:
-                    cache_path.write_text(resolved_policy.model_dump_json(indent=2))
-                    print(f'Saved compliance result to cache: {cache_path}')
-                except Exception as e:
-                    print(f'Failed to save compliance cache: {e}')
+        # Calculate cache key from proposal contents, only hashing the files that changed since the last check
+        proposal_hash = hashlib.sha512(''.join(_file_digest(p) for p in proposal_paths).encode()).hexdigest()
+
+        # Only policies with variables can be evaluated, select them up front so that no empty work is scheduled
+        all_policies = [policy for chapter in self.chapters for policy in chapter.policies]
+        policies = [policy for policy in all_policies if policy.variables]
+        if skipped := len(all_policies) - len(policies):
+            logger.info('Skipping %d empty policies out of %d', skipped, len(all_policies))
+        if not policies:
+            return []
+
+        # Evaluate the policies concurrently, as they mostly wait on the model and the service, keeping their order
+        with ThreadPoolExecutor(max_workers=min(_COMPLIANCE_WORKERS, len(policies))) as executor:
+            return list(executor.map(self._evaluate_policy, policies, repeat(proposal_paths), repeat(proposal_hash)))
+
+    def _evaluate_policy(self, policy: Policy, proposal_paths: list[Path], proposal_hash: str) -> ResolvedPolicy:
+        """
+        Evaluate a policy against a proposal, reusing the cached result of a previous evaluation if available.
+
+        Parameters
+        ----------
+        policy : The policy to evaluate
+        proposal_paths : list of Paths to the documents that compose the proposal
+        proposal_hash : Hash of the contents of the proposal documents
 
-        return resolved_policies
+        Returns
+        -------
+        The policy with its variables resolved and the findings of its assessment
+        """
+        logger.info('Processing policy %s', policy.name)
+        # Calculate cache key for this specific policy + proposal combination, once per process
+        key = (proposal_hash, policy.id, policy.definition_hash)
+        if (hash_key := self._hash_key_cache.get(key)) is None:
+            hash_key = self._hash_key_cache[key] = hashlib.sha512('_'.join(key).encode()).hexdigest()
+        cache_path = config.cache_dir / f'resolved_policy_{hash_key}.json'
+
+        # Try loading from cache
+        if cache_path.exists():
+            try:
+                resolved_policy = ResolvedPolicy.model_validate_json(cache_path.read_bytes())
+                logging.debug(f'Loaded compliance result from cache: {cache_path}')
+                return resolved_policy
+            except Exception as e:
+                logging.debug(f'Failed to load compliance cache: {e}, regenerating')
+
+        # Resolve the variables in the policy for the given proposal
+        resolved_policy = policy.resolve_vars(proposal_paths)
+        resolved_vars = [v for v in resolved_policy.variables
+                         if v.value is not None and v.name != 'IsCompliantWithFullPolicy']
+        if not resolved_vars:
+            resolved_policy.ar_assessment = [{'notApplicable': {}}]
+        else:
+            # Try to avoid TOO_COMPLEX policy errors by reducing the amount
+            # of characters sent to the model. Measure each premise once, including
+            # its separator, and drop them from the tail until the serialization fits
+            claims = {'IsCompliantWithFullPolicy': 'true'}
+            lengths = [len(json.dumps({v.name: v.value}, separators=(',', ':')).replace('"', '')) - 1
+                       for v in resolved_vars]
+            total = len(json.dumps({'premises': {}, 'claims': claims}, separators=(',', ':')).replace('"', '')) \
+                + sum(lengths) - 1
+            if total > 400:
+                logging.warning('Evaluating the policy with a reduced set of variables to '
+                                'try to get results from the system')
+                while resolved_vars and total > 400:
+                    total -= lengths.pop()
+                    resolved_vars.pop()
+
+            assigned_vars = {'premises': {v.name: v.value for v in resolved_vars},
+                             'claims': claims}
+            serialized = json.dumps(assigned_vars, separators=(',', ':')).replace('"', '')
+            # Ask ARc about the assigned vars, obtain their findings
+            bedrock_client = get_bedrock_runtime_client(config.region)
+            content = [{'text': {'text': serialized,
+                                 "qualifiers": ["guard_content"]}}]
+            logging.debug(f'Evaluating {policy.name} guardrail against the set of assigned variables\n' +
+                          json.dumps(assigned_vars, indent=2))
+            with policy.guardrail as guardrail:
+                response = bedrock_client.apply_guardrail(guardrailIdentifier=guardrail.id,
+                                                          guardrailVersion=guardrail.version,
+                                                          content=content,
+                                                          outputScope='FULL',
+                                                          source='OUTPUT')
+            findings = response['assessments'][0]['automatedReasoningPolicy']['findings']
+            resolved_policy.ar_assessment = findings
+
+        # Save to cache
+        try:
+            _atomic_write_bytes(cache_path, to_json(resolved_policy))
+            logger.debug('Saved compliance result to cache: %s', cache_path)
+        except Exception as e:
+            logger.warning('Failed to save compliance cache: %s', e)
+
+        return resolved_policy
 
     def _process_document(self) -> None:
         """
@@ -334,22 +484,25 @@ class TechnicalSpec:
         # Initialize if needed
         if self._introduction is None:
             self._introduction = self._get_chapter(0)
+            try:
+                self._save_introduction()
+            except Exception as e:
+                logger.exception(e)
 
         if self._chapters is None:
             self._chapters = []
 
-        if self._consolidated_text is None:
-            self._consolidated_text = self._introduction.markdown_contents + '\n\n'
-
         # Determine which chapters still need to be extracted
         start_chapter = len(self._chapters) + 1
 
-        # Extract remaining chapters
-        for i in range(start_chapter - 1, self.num_chapters):
-            chapter = self._get_chapter(i + 1)
-            self._chapters.append(chapter)
-            self._consolidated_text += chapter.markdown_contents + '\n\n'
-            self._save_to_cache()
+        # Extract remaining chapters one at a time, as they share the conversation of the agent, while the previous
+        # chapter has its sections extracted and its files saved in the background
+        with ThreadPoolExecutor(max_workers=1) as save_executor:
+            for i in range(start_chapter - 1, self.num_chapters):
+                chapter = self._get_chapter(i + 1)
+                self._chapters.append(chapter)
+                self._consolidated_text = None
+                save_executor.submit(self._save_extracted_chapter, chapter, list(self._chapters))
 
         self._save_to_cache()
 
@@ -372,7 +525,7 @@ class TechnicalSpec:
 
     def _get_chapter(self, num: int) -> Introduction | Chapter:
         """Get chapter with retry logic."""
-        print(f'Getting chapter {num}, agent has {len(self.agent.messages)} messages stored')
+        logger.debug('Getting chapter %d, agent has %d messages stored', num, len(self.agent.messages))
         if num == 0:
             return self.agent.structured_output(Introduction,
                                                 'Convert the contents of everything before chapter '
@@ -402,23 +555,38 @@ class TechnicalSpec:
     def _load_sections_from_files(self, chapter_number: int) -> list[Section]:
         """Helper to load sections from markdown files by scanning the chapter directory."""
         chapter_dir = config.output_dir / f"chapter_{chapter_number:02d}"
-        if not chapter_dir.exists():
+
+        # Find all section_*.md files in the chapter directory with a single scan
+        try:
+            with os.scandir(chapter_dir) as entries:
+                section_files = sorted(Path(entry.path) for entry in entries
+                                       if entry.name.startswith('section_') and entry.name.endswith('.md'))
+        except FileNotFoundError:
             return []
 
-        sections = []
+        # Read the section files concurrently, but build the sections in order in this thread
+        def read_section(section_file: Path) -> str | Exception:
+            try:
+                return section_file.read_text(encoding='utf-8')
+            except Exception as e:
+                return e
 
-        # Find all section_*.md files in the chapter directory
-        section_files = sorted(chapter_dir.glob("section_*.md"))
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            contents = list(executor.map(read_section, section_files))
 
-        for section_file in section_files:
+        sections = []
+        for section_file, markdown_contents in zip(section_files, contents):
             try:
+                if isinstance(markdown_contents, Exception):
+                    raise markdown_contents
+
                 # Generate section metadata from filename and content
                 section_id = f"ch{chapter_number}_{section_file.stem}"
                 section = Section(
                     id=section_id,
                     title=section_file.stem.replace('_', ' ').title(),
                     chapter_number=chapter_number,
-                    markdown_contents=section_file.read_text()
+                    markdown_contents=markdown_contents
                 )
                 sections.append(section)
             except Exception as e:
@@ -440,95 +608,171 @@ class TechnicalSpec:
         self._publication_date = self.metadata.publication_date
         self._num_chapters = self.metadata.num_chapters
 
+        # Read the introduction and chapter files concurrently, as reading them is bound by the file system
+        paths = [config.output_dir / self.metadata.introduction_file] if self.metadata.introduction_file else [None]
+        paths += [config.output_dir / chapter_ref.markdown_file for chapter_ref in self.metadata.chapters or []]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            intro_text, *chapter_texts = executor.map(_read_text_if_exists, paths)
+
         # Load introduction
-        if self.metadata.introduction_file:
-            intro_path = config.output_dir / self.metadata.introduction_file
-            if intro_path.exists():
-                self._introduction = Introduction(markdown_contents=intro_path.read_text())
+        if intro_text is not None:
+            self._introduction = Introduction(markdown_contents=intro_text)
 
         # Load chapters
         if self.metadata.chapters:
             self._chapters = []
-            for chapter_ref in self.metadata.chapters:
-                chapter_path = config.output_dir / chapter_ref.markdown_file
-                if not chapter_path.exists():
+            for chapter_ref, chapter_text in zip(self.metadata.chapters, chapter_texts):
+                if chapter_text is None:
                     continue
 
                 raw_chapter = RawChapter(
                     title=chapter_ref.title,
                     number=chapter_ref.number,
-                    markdown_contents=chapter_path.read_text()
+                    markdown_contents=chapter_text
                 )
-                chapter = Chapter.from_raw(raw_chapter,
-                                           policy_builder=self.policy_builder,
-                                           section_extractor=self.section_extractor,
-                                           metadata=self.metadata)
-
-                # Load sections by scanning directory
+                # Load sections by scanning directory, so that they are not extracted again
+                sections = None
                 if chapter_ref.sections_extracted:
                     sections = self._load_sections_from_files(chapter_ref.number)
-                    chapter._sections = sections if sections else []
 
+                chapter = Chapter.from_raw(raw_chapter,
+                                           policy_builder=self.policy_builder,
+                                           section_extractor=self.section_extractor,
+                                           metadata=self.metadata,
+                                           sections=sections)
                 self._chapters.append(chapter)
 
-        # Rebuild consolidated text
-        if self._introduction:
-            self._consolidated_text = self._introduction.markdown_contents + '\n\n'
-            if self._chapters:
-                for chapter in self._chapters:
-                    self._consolidated_text += chapter.markdown_contents + '\n\n'
-
         logger.debug(f"Loaded cached data for {self.file_path}")
 
     def _save_to_cache(self) -> None:
-        """Save current state to metadata file."""
-        if all(x is not None for x in [self._title, self._author, self._revision,
-                                       self._publication_date, self._num_chapters]):
+        """Save current state to metadata file, rewriting the introduction and every chapter."""
+        if self._has_document_metadata():
             try:
-                # Save introduction to file
-                introduction_file = None
                 if self._introduction:
-                    intro_path = config.output_dir / "introduction.md"
-                    intro_path.write_text(self._introduction.markdown_contents)
-                    introduction_file = "introduction.md"
-
-                # Save chapters to hierarchical structure
-                chapter_refs = None
-                if self._chapters:
-                    chapter_refs = []
-                    for chapter in self._chapters:
-                        chapter_dir = config.output_dir / f"chapter_{chapter.number:02d}"
-                        chapter_dir.mkdir(exist_ok=True)
-
-                        # Save chapter markdown
-                        chapter_md_path = chapter_dir / "chapter.md"
-                        chapter_md_path.write_text(chapter.markdown_contents)
-
-                        # Save section markdowns (no references stored in cache)
-                        for i, section in enumerate(chapter.sections, 1):
-                            section_path = chapter_dir / f"section_{i:02d}.md"
-                            section_path.write_text(section.markdown_contents)
-
-                        chapter_refs.append(RawChapterRef(
-                            title=chapter.title,
-                            number=chapter.number,
-                            markdown_file=f"chapter_{chapter.number:02d}/chapter.md",
-                            sections_extracted=True
-                        ))
-
-                # Update metadata
-                metadata = self.metadata
-                metadata.file_hash = self.file_hash
-                metadata.title = self._title
-                metadata.author = self._author
-                metadata.revision = self._revision
-                metadata.publication_date = self._publication_date
-                metadata.num_chapters = self._num_chapters
-                metadata.introduction_file = introduction_file
-                metadata.chapters = chapter_refs
-                metadata.updated_at = datetime.now()
+                    self._save_introduction()
+                for chapter in self._chapters or []:
+                    self._save_chapter(chapter)
 
-                self._save_metadata()
-                logger.warning(f'Saved metadata for {self.file_path}')
+                self._save_metadata_only()
             except Exception as e:
                 logger.exception(e)
+
+    def _has_document_metadata(self) -> bool:
+        """Check if the document metadata has been extracted, which is required before saving anything."""
+        return all(x is not None for x in [self._title, self._author, self._revision,
+                                           self._publication_date, self._num_chapters])
+
+    def _save_introduction(self) -> None:
+        """Save the introduction markdown to the output folder."""
+        intro_path = config.output_dir / "introduction.md"
+        self._write_text_if_changed(intro_path, self._introduction.markdown_contents)
+
+    def _save_chapter(self, chapter: Chapter) -> None:
+        """
+        Save the markdown of a chapter and its sections to the hierarchical structure of the output folder.
+
+        Parameters
+        ----------
+        chapter : The chapter to save
+        """
+        chapter_dir = config.output_dir / f"chapter_{chapter.number:02d}"
+        chapter_dir.mkdir(exist_ok=True)
+
+        # Save chapter markdown
+        chapter_md_path = chapter_dir / "chapter.md"
+        self._write_text_if_changed(chapter_md_path, chapter.markdown_contents)
+
+        # Save section markdowns (no references stored in cache)
+        for i, section in enumerate(chapter.sections, 1):
+            section_path = chapter_dir / f"section_{i:02d}.md"
+            self._write_text_if_changed(section_path, section.markdown_contents)
+
+    def _write_text_if_changed(self, path: Path, text: str) -> None:
+        """
+        Write a text file of the output folder, unless it already holds the same contents.
+
+        Parameters
+        ----------
+        path : Path of the file to write
+        text : Contents of the file
+        """
+        data = text.encode('utf-8')
+        digest = hashlib.sha256(data).digest()
+        if path not in self._written_digests and path.exists():
+            # Files loaded from the cache are compared once, reading them is cheaper than writing them again
+            self._written_digests[path] = hashlib.sha256(path.read_bytes()).digest()
+
+        if self._written_digests.get(path) != digest:
+            _atomic_write_bytes(path, data)
+            self._written_digests[path] = digest
+
+    def _save_extracted_chapter(self, chapter: Chapter, saved_chapters: list[Chapter]) -> None:
+        """
+        Save a newly extracted chapter and update the metadata file to reference it.
+
+        Parameters
+        ----------
+        chapter : The newly extracted chapter
+        saved_chapters : Chapters whose files are saved once this one is, which are the ones referenced by the metadata
+        """
+        try:
+            self._save_chapter(chapter)
+            self._save_metadata_only(saved_chapters)
+        except Exception as e:
+            logger.exception(e)
+
+    def _save_metadata_only(self, chapters: list[Chapter] | None = None) -> None:
+        """
+        Update the metadata file with the current state, referencing the files saved to the output folder.
+
+        Parameters
+        ----------
+        chapters : Chapters to reference in the metadata, all the loaded chapters if not provided
+        """
+        chapters = self._chapters if chapters is None else chapters
+        chapter_refs = None
+        if chapters:
+            chapter_refs = [RawChapterRef(title=chapter.title,
+                                          number=chapter.number,
+                                          markdown_file=f"chapter_{chapter.number:02d}/chapter.md",
+                                          sections_extracted=True)
+                            for chapter in chapters]
+
+        # Update metadata
+        metadata = self.metadata
+        metadata.file_hash = self.file_hash
+        metadata.title = self._title
+        metadata.author = self._author
+        metadata.revision = self._revision
+        metadata.publication_date = self._publication_date
+        metadata.num_chapters = self._num_chapters
+        metadata.introduction_file = "introduction.md" if self._introduction else None
+        metadata.chapters = chapter_refs
+        metadata.updated_at = datetime.now()
+
+        self._save_metadata()
+        logger.warning(f'Saved metadata for {self.file_path}')
+
+
+def get_spec(file_path: Path) -> TechnicalSpec:
+    """
+    Get the technical specification of a file, reusing the instance already in use for the same unchanged file and
+    output directory, so that its policy builder, section extractor and loaded contents are shared.
+
+    Parameters
+    ----------
+    file_path : Path to the technical specification PDF
+
+    Returns
+    -------
+    The technical specification
+    """
+    if not file_path.is_file():
+        raise RuntimeError(f"Cannot read input PDF file: {file_path}")
+
+    stat = file_path.stat()
+    key = (str(file_path.absolute()), stat.st_mtime_ns, stat.st_size, config.output_dir)
+    if (spec := _spec_cache.get(key)) is None:
+        spec = _spec_cache[key] = TechnicalSpec(file_path=file_path)
+
+    return spec